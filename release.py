@@ -14,7 +14,11 @@ def release(zip_name, test = True):
     try:
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as z:
             for root, dirs, files in os.walk(folder_path):
+                # the command line tool runs outside of Blender and isn't part of the extension, nor are compiled leftovers of it
+                dirs[:] = [d for d in dirs if d != "__pycache__"]
                 for file in files:
+                    if file == "headless.py":
+                        continue
                     file_path = os.path.join(root, file)
                     arcname = os.path.relpath(file_path, folder_path)
                     z.write(file_path, arcname)
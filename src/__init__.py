@@ -13,8 +13,8 @@ def _get_registration_data():
     from . import ui
     from . import trimmer
 
-    classes1 = [trimmer.UVCoord, trimmer.Trim, trimmer.Trimsheet, ui.AbstractOperator, ui.AddTrimSheetButton, ui.DeleteTrimSheetButton, ui.AddTrimButton, ui.DeleteTrimButton, ui.ReorderTrimButton, ui.ApplyTrimButton, ui.TrimOptions]
-    classes2 = [ui.TrimmerUI, ui.ApplyTrimSettings]
+    classes1 = [trimmer.UVCoord, trimmer.Trim, trimmer.Trimsheet, ui.AbstractOperator, ui.AddTrimSheetButton, ui.DeleteTrimSheetButton, ui.AddTrimButton, ui.DeleteTrimButton, ui.ReorderTrimButton, ui.ApplyTrimButton, ui.TrimOptions, ui.TrimGroup, ui.AddTrimGroupButton, ui.DeleteTrimGroupButton, ui.ApplyTrimGroupsButton]
+    classes2 = [ui.TrimmerUI, ui.ApplyTrimSettings, ui.TrimGroupsUI]
 
     return bpy, trimmer, ui, classes1, classes2
 
@@ -26,16 +26,25 @@ def register():
         
     bpy.types.Scene.trimsheet_collection = bpy.props.CollectionProperty(type=trimmer.Trimsheet)
     bpy.types.Scene.trim_options = bpy.props.PointerProperty(type=ui.TrimOptions)
+    bpy.types.Scene.trim_groups = bpy.props.CollectionProperty(type=ui.TrimGroup)
 
     for c in classes2:
         bpy.utils.register_class(c)
 
+    trimmer.subscribeModeChanges()
+    bpy.app.handlers.load_post.append(trimmer.subscribeModeChanges)
+
 def unregister():
-    bpy, _, _, classes1, classes2 = _get_registration_data()
+    bpy, trimmer, _, classes1, classes2 = _get_registration_data()
     
+    bpy.app.handlers.load_post.remove(trimmer.subscribeModeChanges)
+    trimmer.unsubscribeModeChanges()
+    trimmer.Trimmer.clear()
+
     for c in (classes1 + classes2)[::-1]:
         bpy.utils.unregister_class(c)
 
+    del bpy.types.Scene.trim_groups
     del bpy.types.Scene.trim_options
     del bpy.types.Scene.trimsheet_collection
 
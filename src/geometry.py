@@ -0,0 +1,177 @@
+import numpy as np
+from .utils import coefficient
+
+# Points
+
+def asPoints(points):
+    return np.ascontiguousarray(points, dtype=float)
+
+def packPolygons(polygons):
+    counts = np.array([len(polygon) for polygon in polygons], dtype=int)
+    points = asPoints([point for polygon in polygons for point in polygon])
+    return points, counts
+
+def unpackPolygons(points, counts):
+    points = points.tolist()
+    offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
+    return [points[offsets[i]:offsets[i + 1]] for i in range(len(counts))]
+
+def homogeneous(points, size):
+    padded = np.ones(points.shape[:-1] + (size,))
+    width = min(size, points.shape[-1])
+    padded[..., :width] = points[..., :width]
+    return padded
+
+# Transforms
+
+def transform(matrix, points, translation = False):
+    matrix = np.asarray(matrix, dtype=float)
+    points = asPoints(points)
+    if not translation:
+        return points @ matrix.T
+
+    return (homogeneous(points, len(matrix)) @ matrix.T)[..., :len(matrix) - 1]
+
+def transformBatch(matrices, points):
+    # one 2D homogeneous matrix per row of points, points are (n, 2) or (n, corners, 2)
+    linear = matrices[:, :2, :2]
+    translations = matrices[:, :2, 2]
+    if points.ndim == 2:
+        return np.einsum('nij,nj->ni', linear, points) + translations
+    return np.einsum('nij,nvj->nvi', linear, points) + translations[:, None]
+
+def translationRotationMatrices(o1, o2, t1, t2):
+    vectorO = o1 - o2
+    vectorT = t1 - t2
+    product = np.linalg.norm(vectorO, axis=1) * np.linalg.norm(vectorT, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosTheta = np.sum(vectorO * vectorT, axis=1) / product
+        sinTheta = (vectorO[:, 0] * vectorT[:, 1] - vectorO[:, 1] * vectorT[:, 0]) / product
+
+    T = np.zeros((len(o1), 3, 3))
+    T[:, 0, 0] = cosTheta
+    T[:, 0, 1] = -sinTheta
+    T[:, 1, 0] = sinTheta
+    T[:, 1, 1] = cosTheta
+    T[:, :2, 2] = t1 - np.einsum('nij,nj->ni', T[:, :2, :2], o1)
+    T[:, 2, 2] = 1
+
+    return T
+
+def rotationMatrix(degrees):
+    radians = np.radians(degrees)
+    sinTheta = np.sin(radians)
+    cosTheta = np.cos(radians)
+
+    return np.array([
+        [cosTheta, -sinTheta],
+        [sinTheta,  cosTheta]
+    ])
+
+def rotationMatricesToFlatten(normals):
+    # Rodrigues' rotation of every normal onto (0, 0, 1)
+    v = np.zeros_like(normals)
+    v[:, 0] = normals[:, 1]
+    v[:, 1] = -normals[:, 0]
+    cosTheta = normals[:, 2]
+
+    K = np.zeros((len(normals), 3, 3))
+    K[:, 0, 2] = v[:, 1]
+    K[:, 1, 2] = -v[:, 0]
+    K[:, 2, 0] = -v[:, 1]
+    K[:, 2, 1] = v[:, 0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        R = np.eye(3) + K + (K @ K) / (1 + cosTheta)[:, None, None]
+
+    # normals parallel to the z axis have (1, 0, 0) as their perpendicular vector
+    aligned = np.all(v == 0, axis=1)
+    R[aligned & (cosTheta > 0)] = np.eye(3)
+    R[aligned & ~(cosTheta > 0)] = np.diag((1.0, -1.0, -1.0))
+
+    return R
+
+# Polygons
+
+def cornerIndexes(counts, maxCount):
+    corners = np.arange(maxCount)
+    valid = corners < counts[:, None]
+    safeCounts = np.maximum(counts, 1)[:, None]
+    prevCorners = (corners - 1) % safeCounts
+    nextCorners = (corners + 1) % safeCounts
+    return prevCorners, nextCorners, valid
+
+def faceNormals(points, counts):
+    rows = np.arange(len(points))[:, None]
+    prevCorners, nextCorners, valid = cornerIndexes(counts, points.shape[1])
+
+    # a corner is skipped, like in compactPoints, when it is collinear with its neighbours
+    turns = np.cross(points - points[rows, prevCorners], points[rows, nextCorners] - points)
+    EPSILON = 10 ** -coefficient
+    nonCollinear = valid & np.any(np.abs(turns) >= EPSILON, axis=2)
+
+    first = np.argsort(~nonCollinear, axis=1, kind='stable')[:, :3]
+    P1, P2, P3 = (points[rows[:, 0], first[:, k]] for k in range(3))
+    normals = np.cross(P2 - P1, P3 - P2)
+
+    lengths = np.linalg.norm(normals, axis=1)
+    nonZero = lengths > 0
+    normals[nonZero] /= lengths[nonZero, None]
+
+    return normals
+
+def signedAreas(faces, counts):
+    nextCorners = (np.arange(faces.shape[1]) + 1) % np.maximum(counts, 1)[:, None]
+    nextPoints = np.take_along_axis(faces, nextCorners[:, :, None], axis=1)
+    valid = np.arange(faces.shape[1]) < counts[:, None]
+    crossed = faces[..., 0] * nextPoints[..., 1] - nextPoints[..., 0] * faces[..., 1]
+    return np.sum(np.where(valid, crossed, 0), axis=1) / 2
+
+def collinearPoints(points):
+    points = asPoints(points)
+    if len(points) < 3:
+        return np.zeros(len(points), dtype=bool)
+
+    v1 = points - np.roll(points, 1, axis=0)
+    v2 = np.roll(points, -1, axis=0) - points
+
+    # same test as isCollinear: cross multiply by the first axis where either vector moves
+    moving = (v1 != 0) | (v2 != 0)
+    axis = np.argmax(moving, axis=1)[:, None]
+    v1Axis = np.take_along_axis(v1, axis, axis=1)
+    v2Axis = np.take_along_axis(v2, axis, axis=1)
+    EPSILON = 10 ** -coefficient
+    return np.all(np.abs(v1 * v2Axis - v2 * v1Axis) < EPSILON, axis=1)
+
+def pointInPolygon(point, polygon):
+    polygon = asPoints(polygon)[:, :2]
+    x, y = point[0], point[1]
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    crosses = (y1 > y) != (y2 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossingX = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    return bool(np.count_nonzero(crosses & (x < crossingX)) % 2)
+
+def convexHull(points):
+    # Andrew's monotone chain, collinear points are left out
+    points = np.unique(asPoints(points)[:, :2], axis=0).tolist()
+    if len(points) < 3:
+        return asPoints(points).reshape(-1, 2)
+
+    def halfHull(points):
+        hull = []
+        for point in points:
+            while len(hull) >= 2:
+                (x1, y1), (x2, y2) = hull[-2], hull[-1]
+                if (x2 - x1) * (point[1] - y1) - (y2 - y1) * (point[0] - x1) > 0:
+                    break
+                hull.pop()
+            hull.append(point)
+        return hull
+
+    lower = halfHull(points)
+    upper = halfHull(points[::-1])
+    return asPoints(lower[:-1] + upper[:-1])
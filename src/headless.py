@@ -0,0 +1,352 @@
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from multiprocessing import Pool
+from .indexed_mesh import IndexedMesh
+from .geometry import faceNormals
+from .multiple_face_unwrap import graphOfFaces
+from .apply_session import TrimmerException, groupSessions
+
+fitOptions = ['FILL', 'FIT', 'FIT_X', 'FIT_Y']
+
+# Trimsheets
+
+def readTrimsheet(definition):
+    # {"trims": {name: [[u, v], ...]}, "groups": {key: {"trim": name, "fit": option, "sharpAngle": degrees}}, "separateIslands": bool}
+    trims = {name: [tuple(coord) for coord in coords] for name, coords in definition.get('trims', {}).items()}
+
+    groupTrims, sharpAngles = {}, {}
+    for key, group in definition.get('groups', {}).items():
+        if group.get('trim') not in trims:
+            raise TrimmerException(f"Group {key} references an unknown trim {group.get('trim')}!")
+
+        fitOption = group.get('fit', 'FILL')
+        if fitOption not in fitOptions:
+            raise TrimmerException(f"Invalid fit option for group {key}: {fitOption}")
+
+        groupTrims[key] = (group['trim'], trims[group['trim']], fitOption)
+
+        if 'sharpAngle' in group:
+            sharpAngle = group['sharpAngle']
+            if type(sharpAngle) not in [int, float] or sharpAngle < 0:
+                raise TrimmerException(f"Invalid sharp angle for group {key}: {sharpAngle}")
+            sharpAngles[key] = sharpAngle
+
+    return groupTrims, definition.get('separateIslands', False), sharpAngles
+
+def groupKeys(faceKeys, groupTrims):
+    # the group "*" takes the faces no other group claims
+    if '*' not in groupTrims:
+        return faceKeys
+    return [key if key in groupTrims else '*' for key in faceKeys]
+
+def sharpSeams(mesh, faceAngles):
+    # the files carry no seams, so neighbouring faces are cut apart where they meet at more than the sharp angle of their group
+    pairs = [(face, neighbour) for face, neighbours in enumerate(graphOfFaces(mesh)) for neighbour in neighbours if face < neighbour]
+    pairs = np.array(pairs, dtype=int).reshape(-1, 2)
+
+    normals = faceNormals(*mesh.packed(3))
+    angles = np.degrees(np.arccos(np.clip(np.sum(normals[pairs[:, 0]] * normals[pairs[:, 1]], axis=1), -1, 1)))
+    return pairs[angles > np.minimum(faceAngles[pairs[:, 0]], faceAngles[pairs[:, 1]])].tolist()
+
+def trimUvs(mesh, faceKeys, groupTrims, separateIslands, sharpAngles = {}):
+    uvs = np.full((len(mesh.faceVertices), 2), np.nan)
+    faceKeys = groupKeys(faceKeys, groupTrims)
+
+    seams = []
+    if len(sharpAngles) > 0:
+        seams = sharpSeams(mesh, np.array([sharpAngles.get(key, np.inf) for key in faceKeys], dtype=float))
+
+    groups = groupSessions(list(range(len(mesh))), mesh, seams, faceKeys, groupTrims, separateIslands, workers=1)
+
+    for positions, session in groups:
+        corners, _ = mesh.subsetCorners(positions)
+        uvs[corners] = session.uvCoords
+
+    return uvs
+
+# OBJ
+
+class ObjMesh():
+    def __init__(self, lines):
+        self.lines = lines
+        self.faceLines = []
+        self.faceKeys = []
+        vertices, faceVertices, faceOffsets = [], [], [0]
+        self.cornerUvs, self.cornerNormals = [], []
+        self.insertAt, self.uvsBefore = len(lines), 0
+
+        uvCount, normalCount, key = 0, 0, ''
+        for i, line in enumerate(lines):
+            tokens = line.split()
+            if len(tokens) == 0:
+                continue
+
+            if tokens[0] == 'v':
+                vertices.append([float(value) for value in tokens[1:4]])
+            elif tokens[0] == 'vt':
+                uvCount += 1
+            elif tokens[0] == 'vn':
+                normalCount += 1
+            elif tokens[0] == 'usemtl':
+                key = ' '.join(tokens[1:])
+            elif tokens[0] == 'f':
+                if len(self.faceLines) == 0:
+                    self.insertAt, self.uvsBefore = i, uvCount
+
+                for corner in tokens[1:]:
+                    indexes = corner.split('/') + ['', '']
+                    faceVertices.append(ObjMesh.absoluteIndex(indexes[0], len(vertices)))
+                    self.cornerUvs.append(ObjMesh.absoluteIndex(indexes[1], uvCount))
+                    self.cornerNormals.append(ObjMesh.absoluteIndex(indexes[2], normalCount))
+                faceOffsets.append(len(faceVertices))
+                self.faceLines.append(i)
+                self.faceKeys.append(key)
+
+        self.mesh = IndexedMesh(np.array(vertices, dtype=float).reshape(-1, 3), faceVertices, faceOffsets)
+
+    @staticmethod
+    def absoluteIndex(index, count):
+        if index == '':
+            return -1
+        index = int(index)
+        return index - 1 if index > 0 else count + index
+
+    @classmethod
+    def read(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(f.read().splitlines())
+
+    def writeLines(self, uvs):
+        # the new UVs go in front of the first face, the UVs after it move back by as many
+        updated = ~np.isnan(uvs[:, 0])
+        newUvs = np.full(len(uvs), -1)
+        newUvs[updated] = self.uvsBefore + np.arange(np.count_nonzero(updated))
+        shift = np.count_nonzero(updated)
+
+        cornerUvs = np.array(self.cornerUvs, dtype=int).reshape(-1)
+        cornerUvs = np.where(cornerUvs >= self.uvsBefore, cornerUvs + shift, cornerUvs)
+        cornerUvs = np.where(updated, newUvs, cornerUvs).tolist()
+
+        faceLines = dict(zip(self.faceLines, range(len(self.faceLines))))
+        faceVertices, faceOffsets = self.mesh.faceVertices.tolist(), self.mesh.faceOffsets.tolist()
+
+        lines = []
+        for i, line in enumerate(self.lines):
+            if i == self.insertAt:
+                lines.extend(f"vt {u:.6f} {v:.6f}" for u, v in uvs[updated].tolist())
+            if i not in faceLines:
+                lines.append(line)
+                continue
+
+            face = faceLines[i]
+            corners = range(faceOffsets[face], faceOffsets[face + 1])
+            lines.append('f ' + ' '.join(ObjMesh.cornerToken(faceVertices[c], cornerUvs[c], self.cornerNormals[c]) for c in corners))
+
+        if self.insertAt == len(self.lines):
+            lines.extend(f"vt {u:.6f} {v:.6f}" for u, v in uvs[updated].tolist())
+
+        return lines
+
+    @staticmethod
+    def cornerToken(vertex, uv, normal):
+        if normal >= 0:
+            return f"{vertex + 1}/{uv + 1 if uv >= 0 else ''}/{normal + 1}"
+        if uv >= 0:
+            return f"{vertex + 1}/{uv + 1}"
+        return f"{vertex + 1}"
+
+    def write(self, path, uvs):
+        with open(path, 'w', encoding="utf-8") as f:
+            f.write('\n'.join(self.writeLines(uvs)) + '\n')
+
+# PLY
+
+class PlyMesh():
+    uvNames = [('s', 't'), ('u', 'v'), ('texture_u', 'texture_v')]
+
+    def __init__(self, lines, groupProperty = None):
+        if len(lines) == 0 or lines[0].strip() != 'ply':
+            raise TrimmerException("Not a PLY file!")
+
+        elements = []
+        end = None
+        for i, line in enumerate(lines[1:], 1):
+            tokens = line.split()
+            if len(tokens) == 0 or tokens[0] in ['comment', 'obj_info']:
+                continue
+            if tokens[0] == 'format' and tokens[1] != 'ascii':
+                raise TrimmerException(f"Only ASCII PLY files are supported, not {tokens[1]}!")
+            if tokens[0] == 'element':
+                elements.append((tokens[1], int(tokens[2]), []))
+            elif tokens[0] == 'property':
+                elements[-1][2].append(tokens[1:])
+            elif tokens[0] == 'end_header':
+                end = i
+                break
+
+        if end == None or [name for name, _, _ in elements] != ['vertex', 'face']:
+            raise TrimmerException("Only PLY files with a vertex and a face element are supported!")
+
+        values = iter(' '.join(lines[end + 1:]).split())
+        (_, vertexCount, self.vertexProperties), (_, faceCount, self.faceProperties) = elements
+
+        self.vertexRows = [[next(values) for _ in self.vertexProperties] for _ in range(vertexCount)]
+        self.faceRows = []
+        faceVertices, faceOffsets = [], [0]
+        self.faceKeys = []
+        for _ in range(faceCount):
+            row = []
+            for prop in self.faceProperties:
+                if prop[0] == 'list':
+                    count = int(next(values))
+                    items = [int(next(values)) for _ in range(count)]
+                    if prop[-1] in ['vertex_indices', 'vertex_index']:
+                        faceVertices.extend(items)
+                        faceOffsets.append(len(faceVertices))
+                    row.append(items)
+                else:
+                    row.append(next(values))
+            self.faceRows.append(row)
+
+            names = [prop[-1] for prop in self.faceProperties]
+            self.faceKeys.append(row[names.index(groupProperty)] if groupProperty in names else '')
+
+        names = [prop[-1] for prop in self.vertexProperties]
+        coords = np.array([[float(row[names.index(axis)]) for axis in 'xyz'] for row in self.vertexRows]).reshape(-1, 3)
+        self.mesh = IndexedMesh(coords, faceVertices, faceOffsets)
+
+        self.vertexUvs = np.zeros((vertexCount, 2))
+        for uName, vName in PlyMesh.uvNames:
+            if uName in names and vName in names:
+                self.vertexUvs = np.array([[float(row[names.index(uName)]), float(row[names.index(vName)])] for row in self.vertexRows]).reshape(-1, 2)
+                break
+
+    @classmethod
+    def read(cls, path, groupProperty = None):
+        with open(path, encoding="utf-8") as f:
+            return cls(f.read().splitlines(), groupProperty)
+
+    def writeLines(self, uvs):
+        # PLY UVs belong to vertices, so a vertex is split for every different UV its corners get
+        cornerVertices = self.mesh.faceVertices
+        cornerUvs = np.where(np.isnan(uvs), self.vertexUvs[cornerVertices], uvs)
+        # vertices no face uses are kept as they were
+        loose = np.setdiff1d(np.arange(len(self.vertexRows)), cornerVertices)
+        rows = np.vstack((
+            np.column_stack((loose, np.round(self.vertexUvs[loose], 6))),
+            np.column_stack((cornerVertices, np.round(cornerUvs, 6)))
+        ))
+        splitVertices, inverse = np.unique(rows, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)[len(loose):].tolist()
+
+        uvNames = {name for names in PlyMesh.uvNames for name in names}
+        kept = [i for i, prop in enumerate(self.vertexProperties) if prop[-1] not in uvNames]
+
+        lines = ['ply', 'format ascii 1.0', f"element vertex {len(splitVertices)}"]
+        lines.extend('property ' + ' '.join(self.vertexProperties[i]) for i in kept)
+        lines.extend(['property float s', 'property float t', f"element face {len(self.faceRows)}"])
+        lines.extend('property ' + ' '.join(prop) for prop in self.faceProperties)
+        lines.append('end_header')
+
+        for vertex, u, v in splitVertices.tolist():
+            row = self.vertexRows[int(vertex)]
+            lines.append(' '.join([row[i] for i in kept] + [f"{u:.6f}", f"{v:.6f}"]))
+
+        faceOffsets = self.mesh.faceOffsets.tolist()
+        for face, row in enumerate(self.faceRows):
+            tokens = []
+            for prop, value in zip(self.faceProperties, row):
+                if prop[0] != 'list':
+                    tokens.append(value)
+                elif prop[-1] in ['vertex_indices', 'vertex_index']:
+                    corners = inverse[faceOffsets[face]:faceOffsets[face + 1]]
+                    tokens.extend([str(len(corners))] + [str(corner) for corner in corners])
+                else:
+                    tokens.extend([str(len(value))] + [str(item) for item in value])
+            lines.append(' '.join(tokens))
+
+        return lines
+
+    def write(self, path, uvs):
+        with open(path, 'w', encoding="utf-8") as f:
+            f.write('\n'.join(self.writeLines(uvs)) + '\n')
+
+# Files
+
+def readMesh(path, groupProperty = None):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.obj':
+        return ObjMesh.read(path)
+    if extension == '.ply':
+        return PlyMesh.read(path, groupProperty)
+    raise TrimmerException(f"Unsupported mesh file: {path}")
+
+def outputPath(path, outputDirectory = None):
+    stem, extension = os.path.splitext(os.path.basename(path))
+    if outputDirectory == None:
+        return os.path.join(os.path.dirname(path), f"{stem}_trimmed{extension}")
+    return os.path.join(outputDirectory, stem + extension)
+
+def trimFile(path, groupTrims, separateIslands, sharpAngles = {}, outputDirectory = None, groupProperty = None):
+    meshFile = readMesh(path, groupProperty)
+    uvs = trimUvs(meshFile.mesh, meshFile.faceKeys, groupTrims, separateIslands, sharpAngles)
+    output = outputPath(path, outputDirectory)
+    meshFile.write(output, uvs)
+    return output
+
+# Command line
+
+workerSettings = None
+
+def initWorker(settings):
+    global workerSettings
+    workerSettings = settings
+
+def trimWorkerFile(path):
+    groupTrims, separateIslands, sharpAngles, outputDirectory, groupProperty = workerSettings
+    try:
+        return path, trimFile(path, groupTrims, separateIslands, sharpAngles, outputDirectory, groupProperty), None
+    except Exception as e:
+        return path, None, str(e)
+
+def inputPaths(paths):
+    # "-" reads the paths from standard input, one per line, so a job can stream them in
+    for path in paths:
+        if path != '-':
+            yield path
+            continue
+        for line in sys.stdin:
+            if line.strip() != '':
+                yield line.strip()
+
+def main(args = None):
+    parser = argparse.ArgumentParser(prog="trimmer", description="Apply trims to the face groups of OBJ and ASCII PLY meshes without Blender.")
+    parser.add_argument("trimsheet", help="JSON trimsheet definition")
+    parser.add_argument("meshes", nargs='+', help="OBJ or PLY files, - reads the paths from standard input")
+    parser.add_argument("-o", "--output", help="directory for the trimmed meshes, by default they are written next to the inputs")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes, by default one per core")
+    parser.add_argument("--group-property", default=None, help="PLY face property holding the group keys")
+    args = parser.parse_args(args)
+
+    with open(args.trimsheet, encoding="utf-8") as f:
+        groupTrims, separateIslands, sharpAngles = readTrimsheet(json.load(f))
+    if args.output != None:
+        os.makedirs(args.output, exist_ok=True)
+
+    failed = 0
+    settings = (groupTrims, separateIslands, sharpAngles, args.output, args.group_property)
+    with Pool(args.jobs, initializer=initWorker, initargs=(settings,)) as pool:
+        for path, output, error in pool.imap_unordered(trimWorkerFile, inputPaths(args.meshes)):
+            if error != None:
+                failed += 1
+                print(f"{path}: {error}", file=sys.stderr)
+            else:
+                print(f"{path} -> {output}")
+
+    return 1 if failed > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import numpy as np
+
+class IndexedMesh():
+    def __init__(self, coords, faceVertices, faceOffsets):
+        self.coords = np.asarray(coords, dtype=float)
+        self.faceVertices = np.asarray(faceVertices, dtype=int)
+        self.faceOffsets = np.asarray(faceOffsets, dtype=int)
+
+    @classmethod
+    def fromPolygons(cls, polygons):
+        vertexIds = {}
+        faceVertices = []
+        faceOffsets = [0]
+
+        for polygon in polygons:
+            for point in polygon:
+                key = tuple(point)
+                if key not in vertexIds:
+                    vertexIds[key] = len(vertexIds)
+                faceVertices.append(vertexIds[key])
+            faceOffsets.append(len(faceVertices))
+
+        return cls(list(vertexIds), faceVertices, faceOffsets)
+
+    @classmethod
+    def fromCorners(cls, vertexIndexes, cornerCoords, faceOffsets):
+        vertexIndexes = np.asarray(vertexIndexes, dtype=int)
+        cornerCoords = np.asarray(cornerCoords, dtype=float)
+
+        if len(vertexIndexes) == 0:
+            return cls(cornerCoords, vertexIndexes, faceOffsets)
+
+        _, first, faceVertices = np.unique(vertexIndexes, return_index=True, return_inverse=True)
+        return cls(cornerCoords[first], faceVertices, faceOffsets)
+
+    @staticmethod
+    def asIndexedMesh(mesh):
+        if isinstance(mesh, IndexedMesh):
+            return mesh
+        return IndexedMesh.fromPolygons(mesh)
+
+    @staticmethod
+    def asPolygons(mesh):
+        if isinstance(mesh, IndexedMesh):
+            return mesh.toPolygons()
+        return mesh
+
+    def __len__(self):
+        return len(self.faceOffsets) - 1
+
+    def faceCounts(self):
+        return np.diff(self.faceOffsets)
+
+    def face(self, index):
+        return self.faceVertices[self.faceOffsets[index]:self.faceOffsets[index + 1]]
+
+    def faceLists(self):
+        vertices = self.faceVertices.tolist()
+        offsets = self.faceOffsets.tolist()
+        return [vertices[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def cornerCoords(self):
+        return self.coords[self.faceVertices]
+
+    def cornerFaces(self):
+        return np.repeat(np.arange(len(self)), self.faceCounts())
+
+    def cornerIndexes(self):
+        return np.arange(len(self.faceVertices)) - np.repeat(self.faceOffsets[:-1], self.faceCounts())
+
+    def previousCorners(self):
+        counts = np.repeat(self.faceCounts(), self.faceCounts())
+        starts = np.repeat(self.faceOffsets[:-1], self.faceCounts())
+        return starts + (self.cornerIndexes() - 1) % np.maximum(counts, 1)
+
+    def nextCorners(self):
+        counts = np.repeat(self.faceCounts(), self.faceCounts())
+        starts = np.repeat(self.faceOffsets[:-1], self.faceCounts())
+        return starts + (self.cornerIndexes() + 1) % np.maximum(counts, 1)
+
+    def packedIndexes(self):
+        counts = self.faceCounts()
+        corners = np.arange(counts.max(initial=0))
+        valid = corners < counts[:, None]
+        indexes = np.where(valid, self.faceOffsets[:-1, None] + corners, 0)
+        return indexes, valid
+
+    def packed(self, dimensions = None):
+        if dimensions == None:
+            dimensions = self.coords.shape[1] if self.coords.ndim == 2 else 0
+
+        indexes, valid = self.packedIndexes()
+        points = np.zeros(indexes.shape + (dimensions,))
+        if len(self.faceVertices) > 0:
+            coords = self.coords[self.faceVertices[indexes]][..., :dimensions]
+            points[..., :coords.shape[2]] = coords
+        points[~valid] = 0
+
+        return points, self.faceCounts()
+
+    def withCoords(self, coords):
+        return IndexedMesh(coords, self.faceVertices, self.faceOffsets)
+
+    def subsetCorners(self, faceIndexes):
+        faceIndexes = np.asarray(faceIndexes, dtype=int)
+        counts = self.faceCounts()[faceIndexes]
+        faceOffsets = np.concatenate(([0], np.cumsum(counts)))
+
+        corners = np.repeat(self.faceOffsets[faceIndexes], counts) + np.arange(faceOffsets[-1]) - np.repeat(faceOffsets[:-1], counts)
+        return corners, faceOffsets
+
+    def subset(self, faceIndexes):
+        corners, faceOffsets = self.subsetCorners(faceIndexes)
+        used, faceVertices = np.unique(self.faceVertices[corners], return_inverse=True)
+
+        return IndexedMesh(self.coords[used], faceVertices, faceOffsets)
+
+    def toPolygons(self):
+        coords = self.coords.tolist()
+        return [[coords[v] for v in face] for face in self.faceLists()]
+
+    def topology(self):
+        return MeshTopology(self)
+
+class MeshTopology():
+    def __init__(self, mesh):
+        self.mesh = mesh
+        starts = mesh.faceVertices
+        ends = mesh.faceVertices[mesh.nextCorners()]
+
+        vertexCount = len(mesh.coords)
+        keys = np.minimum(starts, ends) * vertexCount + np.maximum(starts, ends)
+        _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+
+        # edges are kept in the order they first appear in
+        order = np.argsort(first)
+        self.edges = np.stack((starts[first[order]], ends[first[order]]), axis=1).reshape(-1, 2)
+        self.edgeFaceCounts = counts[order]
+        self.boundaryEdges = self.edges[self.edgeFaceCounts == 1]
+
+        self.valences = np.bincount(self.edges.ravel(), minlength=vertexCount)
+        self.onBoundary = np.bincount(self.boundaryEdges.ravel(), minlength=vertexCount) > 0
+
+    def vertexEdges(self, vertex):
+        return self.edges[np.any(self.edges == vertex, axis=1)]
+
+    def tips(self, vertexIds):
+        vertexIds = np.asarray(vertexIds, dtype=int)
+        valences = self.valences[vertexIds]
+
+        if np.any(valences < 2):
+            vertex = vertexIds[valences < 2][0]
+            raise Exception(f"Vertex {vertex} only connected by {self.vertexEdges(vertex).tolist()}!")
+
+        return vertexIds[valences == 2]
@@ -1,10 +1,81 @@
 import numpy as np
-import copy
+import hashlib
+from itertools import combinations
+from collections import deque, OrderedDict
 from .utils import *
+from .indexed_mesh import IndexedMesh
+from .geometry import faceNormals, rotationMatricesToFlatten, translationRotationMatrices, transformBatch
 
 class UnwrapException(Exception):
     pass
 
+class UnwrapCache():
+    def __init__(self, maxSize = 8):
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def key(faceIndexes, mesh, seams, *options, hashes = None):
+        mesh = IndexedMesh.asIndexedMesh(mesh)
+        seams = np.array(seamPairs(seams), dtype=np.int64).reshape(-1, 2)
+        if hashes is None:
+            hashes = faceHashes(mesh)
+
+        # the coordinates go in through the face hashes, which the caller can keep to compare single faces later
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (faceIndexes, mesh.faceVertices, mesh.faceOffsets, seams, hashes):
+            digest.update(np.asarray(array, dtype=np.int64).tobytes())
+            digest.update(b'|')
+        digest.update(repr(options).encode())
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        if key not in self.entries:
+            return None
+
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+def mixBits(values):
+    # splitmix64 finalizer, products wrap around in uint64
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+def faceHashes(mesh):
+    # one 64 bit hash per face of its corner coordinates in corner order
+    mesh = IndexedMesh.asIndexedMesh(mesh)
+    if len(mesh) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    # adding zero turns -0.0 into 0.0, so equal coordinates always have equal bits
+    bits = (np.ascontiguousarray(mesh.cornerCoords(), dtype=np.float64).reshape(len(mesh.faceVertices), -1) + 0.0).view(np.uint64)
+    cornerHashes = mixBits(mesh.cornerIndexes().astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15))
+    for axis in range(bits.shape[1]):
+        cornerHashes = mixBits(cornerHashes ^ bits[:, axis])
+
+    return mixBits(np.add.reduceat(cornerHashes, mesh.faceOffsets[:-1]) ^ mesh.faceCounts().astype(np.uint64))
+
+def seamPairs(seams):
+    # a seam edge can be shared by more than two faces, every pair of them is separated
+    pairs = set()
+    for seam in seams:
+        pairs.update(combinations(sorted(set(seam)), 2))
+
+    return sorted(pairs)
+
 def sortEdges(edges):
     edgesCopy = []
     for edge in edges:
@@ -23,111 +94,92 @@ def sortEdges(edges):
 
     return newEdges
 
-def rotationMatrixToFlattenFace(face, indexIncreasing):
-    normal1 = faceNormal(compactPoints(face), indexIncreasing)
-    normal2 = np.array((0, 0, 1))
-    return rotationMatrixFromNormals(normal1, normal2)
-
-def getPerpendicularVector(v):
-    pv = (1, 0, 0)
-    if v[0] != 0:
-        pv = (-v[1], v[0], 0)
-    elif v[1] != 0:
-        pv = (v[2], 0, -v[0])
-
-    return pv
-
-def antiParallelRotationMatrix(v1):        
-    axis = getPerpendicularVector(v1)
-    R = 2 * np.outer(np.array(axis), np.array(axis)) - np.eye(3)
-    return R
-
-def rotationMatrixFromNormals(v1, v2):
-    v1, v2 = normalise(v1), normalise(v2)
-    v = crossProduct(v1, v2)
-
-    if distance(v) == 0:
-        if np.dot(np.array(v1), np.array(v2)) > 0:
-            return np.eye(3)
-        
-        return antiParallelRotationMatrix(v1)
-
-    K = np.array([
-        [0, -v[2], v[1]],
-        [v[2], 0, -v[0]],
-        [-v[1], v[0], 0]
-    ])
-
-    cosTheta = np.dot(v1, v2)
-    R = np.eye(3) + K + np.dot(K, K) / (1 + cosTheta)
-    return R
-
-def faceNormal(face, indexIncreasing):
-    P1, P2, P3 = face[0], face[1], face[2]
-    if not indexIncreasing:
-        P1, P3 = face[2], face[0]
-    return normal(P1, P2, P3)
-
-def flatFaceCoordinates(face, indexIncreasing):
-    R = rotationMatrixToFlattenFace(face, indexIncreasing)
-    return np.dot(np.array(face), R.T)
-
-def sharedEdges(f1, f2):
-    sharedEdges = []
-    for i in range(len(f1)):
-        for j in range(len(f2)):
-            if f1[i] == f2[j]:
-                prevI = (i - 1) % len(f1)
-                nextI = (i + 1) % len(f1)
-                prevJ = (j - 1) % len(f2)
-                nextJ = (j + 1) % len(f2)
-
-                if f1[prevI] == f2[prevJ] or f1[prevI] == f2[nextJ]:
-                    sharedEdges.append((prevI, i))
-    return sharedEdges
-
-def emptyMatrix(n, m):
-    matrix = []
-    for i in range(n):
-        matrix.append([])
-        for j in range(m):
-            matrix[i].append([])
-
-    return matrix
+def flattenFaces(points, counts):
+    normals = faceNormals(points, counts)
+    flattened = np.empty((2,) + points.shape[:2] + (2,))
+    for indexIncreasing in (False, True):
+        R = rotationMatricesToFlatten(normals if indexIncreasing else -normals)
+        flattened[int(indexIncreasing)] = np.einsum('fij,fvj->fvi', R[:, :2], points)
+
+    return flattened
+
+def faceAdjacency(mesh, seams = []):
+    # the owner corner and the neighbour face of every edge two faces share and no seam separates
+    mesh = IndexedMesh.asIndexedMesh(mesh)
+    seamKeys = [i * len(mesh) + j for i, j in seamPairs(seams)]
+
+    faces = mesh.cornerFaces()
+    current = mesh.faceVertices
+    previous = mesh.faceVertices[mesh.previousCorners()]
+
+    vertexCount = current.max(initial=-1) + 1
+    keys = np.minimum(previous, current) * vertexCount + np.maximum(previous, current)
+    order = np.argsort(keys, kind='stable')
+    sortedKeys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sortedKeys[1:] != sortedKeys[:-1]]) if len(keys) > 0 else np.array([], dtype=int)
+    sizes = np.diff(np.r_[starts, len(keys)])
+
+    # most edges are shared by exactly two faces, only non-manifold edges need the pairwise loop
+    pairStarts = starts[sizes == 2]
+    ownerCorners = [order[pairStarts], order[pairStarts + 1]]
+    neighbourCorners = [order[pairStarts + 1], order[pairStarts]]
+    for start, size in zip(starts[sizes > 2], sizes[sizes > 2]):
+        group = order[start:start + size]
+        ownerCorners.append(np.repeat(group, size))
+        neighbourCorners.append(np.tile(group, size))
+
+    ownerCorners = np.concatenate(ownerCorners)
+    neighbours = faces[np.concatenate(neighbourCorners)]
+    owners = faces[ownerCorners]
+
+    keep = (owners != neighbours) & ~np.isin(np.minimum(owners, neighbours) * len(mesh) + np.maximum(owners, neighbours), seamKeys)
+    ownerCorners, neighbours = ownerCorners[keep], neighbours[keep]
+    ordered = np.lexsort((neighbours, ownerCorners))
+    return ownerCorners[ordered], neighbours[ordered]
+
+def adjacencyGraph(mesh, ownerCorners, neighbours):
+    faces = mesh.cornerFaces()
+    graph = [{} for _ in range(len(mesh))]
+    edgeStarts = (mesh.previousCorners() - mesh.faceOffsets[faces])[ownerCorners].tolist()
+    edgeEnds = mesh.cornerIndexes()[ownerCorners].tolist()
+    for faceIndex, neighbourIndex, edge in zip(faces[ownerCorners].tolist(), neighbours.tolist(), zip(edgeStarts, edgeEnds)):
+        if neighbourIndex in graph[faceIndex]:
+            graph[faceIndex][neighbourIndex].append(edge)
+        else:
+            graph[faceIndex][neighbourIndex] = [edge]
+
+    return graph
 
 def graphOfFaces(mesh, seams = []):
-    graphMatrix = emptyMatrix(len(mesh), len(mesh))
+    mesh = IndexedMesh.asIndexedMesh(mesh)
+    return adjacencyGraph(mesh, *faceAdjacency(mesh, seams))
 
-    for i in range(len(mesh)-1):
-        for j in range(i+1, len(mesh)):
-            if (i, j) in seams:
-                continue
+def islandLabels(graph):
+    labels = [None] * len(graph)
 
-            edges = sharedEdges(mesh[i], mesh[j])
-            graphMatrix[i][j] = edges
-            edges = sharedEdges(mesh[j], mesh[i])
-            graphMatrix[j][i] = edges
-    
-    return graphMatrix
+    islandCount = 0
+    for start in range(len(graph)):
+        if labels[start] != None:
+            continue
 
-def dfs(matrix, visited, node):
-    visited[node] = True
-    for neighbor in range(len(matrix)):
-        if len(matrix[node][neighbor]) > 0 and not visited[neighbor]:
-            dfs(matrix, visited, neighbor)
+        labels[start] = islandCount
+        queue = deque([start])
+        while len(queue) > 0:
+            node = queue.popleft()
+            for neighbor in graph[node]:
+                if labels[neighbor] == None:
+                    labels[neighbor] = islandCount
+                    queue.append(neighbor)
+        islandCount += 1
 
-def countIslands(matrix):
-    visited = []
-    for i in range(len(matrix)):
-        visited.append(False)
+    return labels
 
-    islandCount = 0
-    for node in range(len(matrix)):
-        if not visited[node]:
-            dfs(matrix, visited, node)
-            islandCount += 1
-    
-    return islandCount
+def countIslands(graph):
+    labels = islandLabels(graph)
+    if len(labels) == 0:
+        return 0
+
+    return max(labels) + 1
 
 def vertexIndexIncreasing(mesh, f1Index, f2Index, face1Increasing, graph):
     f1 = mesh[f1Index]
@@ -138,94 +190,365 @@ def vertexIndexIncreasing(mesh, f1Index, f2Index, face1Increasing, graph):
     f2EdgeValues = (f2[f2Edge[0]], f2[f2Edge[1]])
     return (f1EdgeValues[0] == f2EdgeValues[0]) ^ face1Increasing
 
-def translationRotationMatrix(o1, o2, t1, t2):
-    vectorO = np.array(subtract(o1, o2))
-    vectorT = np.array(subtract(t1, t2))
-    vOnorm = np.linalg.norm(vectorO)
-    vTnorm = np.linalg.norm(vectorT)
-    product = vOnorm * vTnorm
+def validateSeams(seams, numberOfFaces):
+    for seam in seams:
+        if max(seam) >= numberOfFaces:
+            raise Exception(f"Invalid seam parameter: seam {seam} is referencing indexes larger than the number of faces ({numberOfFaces})")
 
-    cosTheta = np.dot(vectorO, vectorT) / product
-    sinTheta = np.cross(vectorO, vectorT) / product
+    return seamPairs(seams)
 
-    R = np.array([
-        [cosTheta, -sinTheta],
-        [sinTheta,  cosTheta]
-    ])
+def islandFaces(labels):
+    islands = []
+    for faceIndex in range(len(labels)):
+        if labels[faceIndex] == len(islands):
+            islands.append([])
+        islands[labels[faceIndex]].append(faceIndex)
 
-    T = np.eye(3)
-    T[:2, :2] = R
-    T[:2, 2] = t1 - (R @ o1)
+    return islands
 
-    return T
+def mappedFaceList(mapped, counts, faceIndexes):
+    rounded = np.round(mapped, coefficient)
+    return [rounded[i, :counts[i]].tolist() for i in faceIndexes]
 
-def validateSeams(seams, numberOfFaces):
-    validated = []
-    for seam in seams:
-        if max(seam) >= numberOfFaces:
-            raise Exception(f"Invalid seam parameter: seam {seam} is referencing indexes larger than the number of faces ({numberOfFaces})")
-        validated.append(tuple(sorted(seam)))
+def mappedMesh(mesh, mapped, faceIndexes):
+    indexes, valid = mesh.packedIndexes()
+    faceValid = valid[faceIndexes]
+    vertexIndexes = mesh.faceVertices[indexes[faceIndexes][faceValid]]
+    cornerCoords = np.round(mapped[faceIndexes][faceValid], coefficient) + 0.0
 
-    return validated
+    # corners of the same vertex stay welded unless a seam separated them in the flattened mesh
+    keys = np.column_stack((vertexIndexes, cornerCoords))
+    _, first, faceVertices = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    faceOffsets = np.concatenate(([0], np.cumsum(mesh.faceCounts()[faceIndexes])))
 
-def unwrap(mesh, seams = []):
+    return IndexedMesh(cornerCoords[first], faceVertices.ravel(), faceOffsets)
+
+def unwrappedFaces(mesh, mapped, faceIndexes, indexed):
+    if indexed:
+        return mappedMesh(mesh, mapped, faceIndexes)
+    return mappedFaceList(mapped, mesh.faceCounts(), faceIndexes)
+
+def unwrapSingleIsland(mesh, seams):
     seams = validateSeams(seams, len(mesh))
- 
-    mappedFaces = []
-    mappedBy = []
-    for i in range(len(mesh)):
-        mappedFaces.append(None)
-        mappedBy.append([])
 
-    graph = graphOfFaces(mesh, seams)
+    ownerCorners, neighbours = faceAdjacency(mesh, seams)
+    graph = adjacencyGraph(mesh, ownerCorners, neighbours)
     islandCount = countIslands(graph)
     if islandCount == 0:
         raise UnwrapException("Mesh is empty!")
     if islandCount > 1:
         raise UnwrapException(f"Can't unwrap mesh with more than 1 islands (currently {islandCount})!")
 
-    stack = []
-    stack.append((0, True, None, None)) # (<faceIndex>, <vertexIndexIncreasing>, <neighbourIndex>, <neighbourEdgeIndex>)
+    flattened = flattenFaces(*mesh.packed(3))
+    mapped, increasing = unwrapIsland(mesh.faceLists(), graph, flattened, 0)
 
-    while len(stack) > 0:
-        index, indexIncreasing, neighbourIndex, neighbourEdgeIndex = stack.pop()
+    adjacency = np.column_stack((mesh.cornerFaces()[ownerCorners], neighbours)).reshape(-1, 2)
+    return adjacency, mapped, np.array(increasing, dtype=bool)
 
-        if (neighbourIndex, neighbourEdgeIndex) in mappedBy[index]:
-            continue
+def unwrap(mesh, seams = []):
+    indexed = isinstance(mesh, IndexedMesh)
+    mesh = IndexedMesh.asIndexedMesh(mesh)
+    _, mapped, _ = unwrapSingleIsland(mesh, seams)
 
-        for i in range(len(graph[index])):
-            for edgeIndex in range(len(graph[index][i])):
-                if i == neighbourIndex and edgeIndex == neighbourEdgeIndex:
-                    continue
-
-                neighbourIndexIncreasing = vertexIndexIncreasing(mesh, index, i, indexIncreasing, graph)
-                stack.append((i, neighbourIndexIncreasing, index, edgeIndex))
-
-        F = copy.deepcopy(mesh[index])
-        rotatedFace = deepToList(flatFaceCoordinates(F, indexIncreasing))
-        rotatedFace = padPoints(rotatedFace, 2)
-
-        origin1 = rotatedFace[0]
-        origin2 = rotatedFace[1]
-        target1 = rotatedFace[0]
-        target2 = rotatedFace[1]
-        if neighbourIndex != None:
-            origin1 = rotatedFace[graph[index][neighbourIndex][0][0]]
-            origin2 = rotatedFace[graph[index][neighbourIndex][0][1]]
-            target1 = mappedFaces[neighbourIndex][graph[neighbourIndex][index][0][0]]
-            target2 = mappedFaces[neighbourIndex][graph[neighbourIndex][index][0][1]]
-            if indexIncreasing:
-                target1, target2 = target2, target1
-        
-        matrix = translationRotationMatrix(origin1, origin2, target1, target2)
-        transformedFace = applyMatrix(rotatedFace, matrix, True)
-
-        if mappedFaces[index] != None:
-            if compare(mappedFaces[index], transformedFace) != 0:
-                raise UnwrapException("Shape is not unwrappable without distorion!\n(hint: consider marking some edges as seams)")
-        else:
-            mappedFaces[index] = transformedFace
-            mappedBy[index].append((neighbourIndex, neighbourEdgeIndex))
-            if neighbourIndex != None: mappedBy[neighbourIndex].append((index, edgeIndex))
+    return unwrappedFaces(mesh, mapped, list(range(len(mesh))), indexed)
+
+def unwrapIslands(mesh, seams = []):
+    indexed = isinstance(mesh, IndexedMesh)
+    mesh = IndexedMesh.asIndexedMesh(mesh)
+    seams = validateSeams(seams, len(mesh))
+
+    graph = graphOfFaces(mesh, seams)
+    islands = islandFaces(islandLabels(graph))
+    if len(islands) == 0:
+        raise UnwrapException("Mesh is empty!")
+
+    faces = mesh.faceLists()
+    flattened = flattenFaces(*mesh.packed(3))
+
+    unwrapped = []
+    for faceIndexes in islands:
+        mapped, _ = unwrapIsland(faces, graph, flattened, faceIndexes[0])
+        unwrapped.append((faceIndexes, unwrappedFaces(mesh, mapped, faceIndexes, indexed)))
+
+    return unwrapped
+
+def spanningTree(mesh, graph, seeds, increasing):
+    parents = [None] * len(mesh)
+
+    order = []
+    queue = deque(seeds)
+    while len(queue) > 0:
+        index = queue.popleft()
+        for neighbour in sorted(graph[index]):
+            if increasing[neighbour] == None:
+                parents[neighbour] = index
+                increasing[neighbour] = vertexIndexIncreasing(mesh, index, neighbour, increasing[index], graph)
+                order.append(neighbour)
+                queue.append(neighbour)
+
+    return order, parents
+
+def alignedMatrices(flattened, faces, orientations, edges, targets1, targets2):
+    origins1 = flattened[orientations, faces, edges[:, 0]]
+    origins2 = flattened[orientations, faces, edges[:, 1]]
+
+    swap = orientations[:, None] == 1
+    targets1, targets2 = np.where(swap, targets2, targets1), np.where(swap, targets1, targets2)
+
+    return translationRotationMatrices(origins1, origins2, targets1, targets2)
+
+def composeAlongTree(localMatrices, parents):
+    # pointer jumping: every step maps a face into the frame of an ancestor twice as far up,
+    # faces that are their own parent are roots and already hold their final matrix
+    matrices = localMatrices.copy()
+    ancestors = parents.copy()
+    pending = np.flatnonzero(ancestors != np.arange(len(ancestors)))
+    while len(pending) > 0:
+        pendingAncestors = ancestors[pending]
+        matrices[pending] = matrices[pendingAncestors] @ matrices[pending]
+        nextAncestors = ancestors[pendingAncestors]
+        ancestors[pending] = np.where(nextAncestors == pendingAncestors, pending, nextAncestors)
+        pending = pending[ancestors[pending] != pending]
+
+    return matrices
+
+def growPlacement(mesh, graph, flattened, mapped, increasing, seeds):
+    order, parents = spanningTree(mesh, graph, seeds, increasing)
+    if len(order) == 0:
+        return order, parents
+
+    orientations = np.array([int(bool(inc)) for inc in increasing], dtype=int)
+    placed = np.array(order)
+    treeParents = np.array([parents[i] for i in order])
+    edges = np.array([graph[i][parents[i]][0] for i in order])
+    parentEdges = np.array([graph[parents[i]][i][0] for i in order])
+
+    # every face is aligned once with the shared edge of its parent: the final edge of an
+    # already placed parent, or the flattened one of a parent placed in this same pass
+    positions = np.full(len(mesh), -1)
+    positions[placed] = np.arange(len(placed))
+    anchored = positions[treeParents] < 0
+
+    parentOrientations = orientations[treeParents]
+    targets = np.where(
+        anchored[:, None, None],
+        mapped[treeParents[:, None], parentEdges],
+        flattened[parentOrientations[:, None], treeParents[:, None], parentEdges]
+    )
+    localMatrices = alignedMatrices(flattened, placed, orientations[placed], edges, targets[:, 0], targets[:, 1])
+
+    ancestors = np.where(anchored, np.arange(len(placed)), positions[treeParents])
+    matrices = composeAlongTree(localMatrices, ancestors)
+    mapped[placed] = transformBatch(matrices, flattened[orientations[placed], placed])
+
+    return order, parents
+
+def checkPlacement(mesh, graph, flattened, mapped, increasing, parents, faces):
+    EPSILON = 10 ** -coefficient
+
+    # every edge outside the spanning tree must agree with the placement of both of its faces
+    pairs = set()
+    for i in faces:
+        for neighbour in graph[i]:
+            if neighbour != parents[i] and i != parents[neighbour]:
+                pairs.add((i, neighbour))
+                pairs.add((neighbour, i))
+    if len(pairs) == 0:
+        return
+
+    pairs = sorted(pairs)
+    faces = np.array([neighbour for _, neighbour in pairs])
+    neighbours = np.array([i for i, _ in pairs])
+    expected = np.array([int(vertexIndexIncreasing(mesh, i, neighbour, increasing[i], graph)) for i, neighbour in pairs], dtype=int)
+    edges = np.array([graph[neighbour][i][0] for i, neighbour in pairs])
+    neighbourEdges = np.array([graph[i][neighbour][0] for i, neighbour in pairs])
+
+    targets1 = mapped[neighbours, neighbourEdges[:, 0]]
+    targets2 = mapped[neighbours, neighbourEdges[:, 1]]
+    pairMatrices = alignedMatrices(flattened, faces, expected, edges, targets1, targets2)
+    pairFaces = transformBatch(pairMatrices, flattened[expected, faces])
+
+    counts = np.array([len(mesh[i]) for i in faces])
+    valid = np.arange(flattened.shape[2]) < counts[:, None]
+    deviation = np.abs(pairFaces - mapped[faces])
+    if not np.all((deviation < EPSILON)[valid]):
+        raise UnwrapException("Shape is not unwrappable without distorion!\n(hint: consider marking some edges as seams)")
+
+def unwrapIsland(mesh, graph, flattened, start):
+    mapped = np.full(flattened.shape[1:], np.nan)
+    increasing = [None] * len(mesh)
+
+    mapped[start] = flattened[1, start]
+    increasing[start] = True
+    order, parents = growPlacement(mesh, graph, flattened, mapped, increasing, [start])
+    checkPlacement(mesh, graph, flattened, mapped, increasing, parents, [start] + order)
+
+    return mapped, increasing
+
+def connectedFaces(adjacency, faceCount, faces):
+    # breadth first from all the faces at once, joining their searches where they meet,
+    # which usually stops long before the whole island is walked
+    order = np.argsort(adjacency[:, 0], kind='stable')
+    starts = np.searchsorted(adjacency[order, 0], np.arange(faceCount + 1)).tolist()
+    neighbours = adjacency[order, 1].tolist()
+
+    parents = {face: face for face in faces}
+    def root(face):
+        while parents[face] != face:
+            parents[face] = parents[parents[face]]
+            face = parents[face]
+        return face
+
+    sources = {face: face for face in faces}
+    searches = len(faces)
+    queue = deque(faces)
+    while len(queue) > 0 and searches > 1:
+        face = queue.popleft()
+        for neighbour in neighbours[starts[face]:starts[face + 1]]:
+            if neighbour not in sources:
+                sources[neighbour] = sources[face]
+                queue.append(neighbour)
+                continue
 
-    return roundList(deepToList(mappedFaces))
\ No newline at end of file
+            first, second = root(sources[neighbour]), root(sources[face])
+            if first != second:
+                parents[first] = second
+                searches -= 1
+
+    return searches <= 1
+
+class UnwrapLayout():
+    # a single island unwrap together with what growing it needs: the face adjacency, the side every face
+    # was flattened from and the welded flat mesh
+    def __init__(self, flatMesh, increasing, adjacency):
+        self.flatMesh = flatMesh
+        self.increasing = increasing
+        self.adjacency = adjacency
+
+    @classmethod
+    def unwrap(cls, mesh, seams = []):
+        mesh = IndexedMesh.asIndexedMesh(mesh)
+        adjacency, mapped, increasing = unwrapSingleIsland(mesh, seams)
+        return cls(mappedMesh(mesh, mapped, np.arange(len(mesh))), increasing, adjacency)
+
+    def packedFaces(self, faceIndexes):
+        corners, faceOffsets = self.flatMesh.subsetCorners(faceIndexes)
+        return IndexedMesh(self.flatMesh.coords, self.flatMesh.faceVertices[corners], faceOffsets).packed(2)[0]
+
+    def grow(self, mesh, added = [], removed = [], seams = []):
+        # faces are matched in order: the faces of mesh that weren't added are the faces of the layout that weren't removed,
+        # and the seams between them are the ones the layout was made with
+        mesh = IndexedMesh.asIndexedMesh(mesh)
+        seams = validateSeams(seams, len(mesh))
+
+        addedFaces = np.zeros(len(mesh), dtype=bool)
+        addedFaces[np.asarray(added, dtype=int)] = True
+        removedFaces = np.zeros(len(self.flatMesh), dtype=bool)
+        removedFaces[np.asarray(removed, dtype=int)] = True
+        kept, keptPrevious = np.flatnonzero(~addedFaces), np.flatnonzero(~removedFaces)
+
+        if len(kept) != len(keptPrevious):
+            raise UnwrapException(f"Previous unwrap has {len(keptPrevious)} faces left after removing {np.flatnonzero(removedFaces).tolist()}, but the mesh has {len(kept)} faces that were not added!")
+        if np.any(mesh.faceCounts()[kept] != self.flatMesh.faceCounts()[keptPrevious]):
+            raise UnwrapException("Faces kept from the previous unwrap must have the same amount of vertices!")
+        if len(kept) == 0:
+            return UnwrapLayout.unwrap(mesh, seams)
+
+        positions = np.full(len(self.flatMesh), -1)
+        positions[keptPrevious] = kept
+        previousPositions = np.full(len(mesh), -1)
+        previousPositions[kept] = keptPrevious
+
+        adjacency = positions[self.adjacency]
+        if np.any(removedFaces):
+            adjacency = adjacency[np.all(adjacency >= 0, axis=1)]
+        increasing = np.zeros(len(mesh), dtype=bool)
+        increasing[kept] = self.increasing[keptPrevious]
+
+        # the kept faces keep their flat vertices, unused ones are dropped at the end
+        cornerFaces = mesh.cornerFaces()
+        faceVertices = np.full(len(mesh.faceVertices), -1)
+        faceVertices[~addedFaces[cornerFaces]] = self.flatMesh.faceVertices[~removedFaces[self.flatMesh.cornerFaces()]]
+        coords = self.flatMesh.coords
+
+        if np.any(addedFaces):
+            grown = self.placeAdded(mesh, seams, addedFaces, previousPositions, cornerFaces)
+            if grown is None:
+                return UnwrapLayout.unwrap(mesh, seams)
+
+            regionCorners, regionVertices, newCoords, regionAdjacency, regionIncreasing = grown
+            faceVertices[regionCorners] = regionVertices
+            coords = np.concatenate((coords, newCoords))
+            adjacency = np.concatenate((adjacency, regionAdjacency))
+            increasing[addedFaces] = regionIncreasing
+
+        if np.any(removedFaces):
+            # removing faces can split the island, it stays whole if the faces that bordered the removed ones are still connected
+            borders = positions[self.adjacency[removedFaces[self.adjacency[:, 0]], 1]]
+            borders = np.unique(borders[borders >= 0]).tolist()
+            if not connectedFaces(adjacency, len(mesh), borders):
+                return UnwrapLayout.unwrap(mesh, seams)
+
+        used = np.zeros(len(coords), dtype=bool)
+        used[faceVertices] = True
+        vertexPositions = np.cumsum(used) - 1
+        return UnwrapLayout(IndexedMesh(coords[used], vertexPositions[faceVertices], mesh.faceOffsets), increasing, adjacency)
+
+    def placeAdded(self, mesh, seams, addedFaces, previousPositions, cornerFaces):
+        # only the added faces and the faces sharing a vertex with them are unwrapped again,
+        # the kept ones among them are fixed and the added ones are placed against them
+        addedVertices = np.zeros(len(mesh.coords), dtype=bool)
+        addedVertices[mesh.faceVertices[addedFaces[cornerFaces]]] = True
+        inRegion = np.zeros(len(mesh), dtype=bool)
+        inRegion[cornerFaces[addedVertices[mesh.faceVertices]]] = True
+        region = np.flatnonzero(inRegion)
+        regionMesh = mesh.subset(region)
+        regionAdded = addedFaces[region]
+        keptRegion = np.flatnonzero(~regionAdded)
+
+        regionPositions = np.full(len(mesh), -1)
+        regionPositions[region] = np.arange(len(region))
+        regionSeams = regionPositions[np.array(seams, dtype=int).reshape(-1, 2)]
+        regionSeams = regionSeams[np.all(regionSeams >= 0, axis=1)].tolist()
+
+        ownerCorners, neighbours = faceAdjacency(regionMesh, regionSeams)
+        graph = adjacencyGraph(regionMesh, ownerCorners, neighbours)
+        faces = regionMesh.faceLists()
+        flattened = flattenFaces(*regionMesh.packed(3))
+
+        mapped = np.full(flattened.shape[1:], np.nan)
+        keptMapped = self.packedFaces(previousPositions[region[keptRegion]])
+        mapped[keptRegion, :keptMapped.shape[1]] = keptMapped
+        increasing = [None] * len(region)
+        for i, inc in zip(keptRegion.tolist(), self.increasing[previousPositions[region[keptRegion]]].tolist()):
+            increasing[i] = inc
+
+        seeds = [i for i in keptRegion.tolist() if any(regionAdded[neighbour] for neighbour in graph[i])]
+        order, parents = growPlacement(faces, graph, flattened, mapped, increasing, seeds)
+        # added faces the kept ones don't reach form islands of their own
+        if len(order) != np.count_nonzero(regionAdded):
+            return None
+        try:
+            checkPlacement(faces, graph, flattened, mapped, increasing, parents, order)
+        except UnwrapException:
+            return None
+
+        # the added corners are welded to the kept corners of the same vertex at the same place, or to each other
+        regionCorners, _ = mesh.subsetCorners(region)
+        indexes, valid = regionMesh.packedIndexes()
+        cornerCoords = np.round(mapped[valid], coefficient) + 0.0
+        keptCorners = ~regionAdded[regionMesh.cornerFaces()]
+
+        keys = np.column_stack((mesh.faceVertices[regionCorners], cornerCoords))
+        _, first, groups = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        groups = groups.reshape(-1)
+        groupVertices = np.full(len(first), -1)
+        groupVertices[groups[keptCorners]] = self.flatMesh.faceVertices[self.flatMesh.subsetCorners(previousPositions[region[keptRegion]])[0]]
+        newGroups = np.flatnonzero(groupVertices < 0)
+        groupVertices[newGroups] = len(self.flatMesh.coords) + np.arange(len(newGroups))
+
+        addedCorners = ~keptCorners
+        regionAdjacency = region[np.column_stack((regionMesh.cornerFaces()[ownerCorners], neighbours)).reshape(-1, 2)]
+        regionAdjacency = regionAdjacency[np.any(addedFaces[regionAdjacency], axis=1)]
+        regionIncreasing = np.array([increasing[i] for i in np.flatnonzero(regionAdded).tolist()], dtype=bool)
+        return regionCorners[addedCorners], groupVertices[groups[addedCorners]], cornerCoords[first[newGroups]], regionAdjacency, regionIncreasing
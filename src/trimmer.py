@@ -1,38 +1,157 @@
 import bpy
 import bmesh
+from bpy.app.handlers import persistent
 from mathutils import Vector
 from .utils import *
-from .multiple_face_unwrap import unwrap, UnwrapException
-from .utils2D import boundaryVertices, mvcWeights, applyMvcWeights, mirrorPoints, rotatePointsFill, rotatePointsFit
-
-class TrimmerException(Exception):
-    pass
+import numpy as np
+from .multiple_face_unwrap import seamPairs, UnwrapException
+from .indexed_mesh import IndexedMesh
+from .geometry import unpackPolygons
+from .apply_session import ApplySession, TrimmerException, UnwrapHistory, groupSessions
 
 class Trimmer():
-    currentApplyOption = None
-    currentFaceIndexes = None
-    flatMeshCoords = None
-    currentReferenceCoords = None
-    currentTrim = None
+    # apply sessions of the objects being edited, keyed by object name
+    sessions = {}
+    unwrapHistory = UnwrapHistory()
+    # bmesh wrappers of the objects in edit mode: while a wrapper is alive, bmesh keeps the layers that map its
+    # elements to python objects, which otherwise are rebuilt over the whole mesh on every access
+    editMeshes = {}
+    # UV references of the loops the last write of every object went to, valid as long as its bmesh wrapper
+    loopUvs = {}
+    # selections covering at least this share of the mesh faces are read and written in bulk through the mesh data,
+    # smaller ones through bmesh, which costs per selected face instead of per mesh face
+    bulkShare = 0.3
 
     @classmethod
-    def clear(cls):
-        cls.currentApplyOption = None
-        cls.currentFaceIndexes = None
-        cls.flatMeshCoords = None
-        cls.currentReferenceCoords = None
-        cls.currentTrim = None
+    def activeSession(cls, context):
+        obj = context.object
+        if obj is None:
+            return None
+
+        for other in [obj] + list(context.objects_in_mode):
+            if other.name in cls.sessions:
+                return cls.sessions[other.name]
+        return None
 
     @classmethod
-    def getFacesFromIndexes(cls, bm):
-        return [bm.faces[faceIndex] for faceIndex in cls.currentFaceIndexes]
+    def getSessions(cls, context):
+        sessions = [(obj, cls.sessions[obj.name]) for obj in cls.getObjects(context) if obj.name in cls.sessions]
+        if len(sessions) == 0:
+            raise TrimmerException("No trim has been applied to the object!")
+
+        return sessions
+
+    @classmethod
+    def clear(cls, context = None, releaseMeshes = True):
+        if context == None:
+            cls.sessions.clear()
+            cls.editMeshes.clear()
+            cls.loopUvs.clear()
+        elif context.object is not None:
+            for obj in [context.object] + list(context.objects_in_mode):
+                cls.sessions.pop(obj.name, None)
+                cls.loopUvs.pop(obj.name, None)
+                if releaseMeshes:
+                    cls.editMeshes.pop(obj.name, None)
+
+    @classmethod
+    def releaseEditMeshes(cls):
+        # bmesh frees the edit mesh when its object leaves edit mode, the wrappers left of it are dead
+        for name, bm in list(cls.editMeshes.items()):
+            obj = bpy.data.objects.get(name)
+            if obj is None or obj.mode != 'EDIT' or not bm.is_valid:
+                cls.editMeshes.pop(name)
+                cls.loopUvs.pop(name, None)
 
     @staticmethod
-    def uvCoordsFromFaces(faces, uvLayer, single = False):
-        if single:
-            return [loop[uvLayer].uv[:] for loop in faces.loops]
-        else:
-            return [[loop[uvLayer].uv[:] for loop in face.loops] for face in faces]
+    def readArray(collection, attribute, dtype, width = 1):
+        values = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attribute, values)
+        return values.reshape(-1, width) if width > 1 else values
+
+    @staticmethod
+    def faceCorners(mesh, faceIndexes):
+        faceIndexes = np.asarray(faceIndexes, dtype=int)
+        loopStarts = Trimmer.readArray(mesh.polygons, 'loop_start', np.int32)[faceIndexes]
+        counts = Trimmer.readArray(mesh.polygons, 'loop_total', np.int32)[faceIndexes]
+
+        faceOffsets = np.concatenate(([0], np.cumsum(counts)))
+        corners = np.repeat(loopStarts - faceOffsets[:-1], counts) + np.arange(faceOffsets[-1])
+        return corners, faceOffsets
+
+    @staticmethod
+    def readMeshCoords(mesh, faceIndexes):
+        corners, faceOffsets = Trimmer.faceCorners(mesh, faceIndexes)
+        vertexIndexes = Trimmer.readArray(mesh.loops, 'vertex_index', np.int32)[corners]
+        coords = Trimmer.readArray(mesh.vertices, 'co', np.float64, 3)
+
+        return IndexedMesh.fromCorners(vertexIndexes, coords[vertexIndexes], faceOffsets)
+
+    @staticmethod
+    def cornerSeams(edges, seams, faceOffsets):
+        # every seam edge separates each pair of the selected faces sharing it
+        cornerFaces = np.repeat(np.arange(len(faceOffsets) - 1), np.diff(faceOffsets))
+        order = np.lexsort((cornerFaces[seams], edges[seams]))
+        seamEdges, seamFaces = edges[seams][order].tolist(), cornerFaces[seams][order].tolist()
+
+        neighborFaceLists = []
+        for i, edge in enumerate(seamEdges):
+            if i == 0 or seamEdges[i - 1] != edge:
+                neighborFaceLists.append([])
+            neighborFaceLists[-1].append(seamFaces[i])
+
+        return seamPairs(neighborFaceLists)
+
+    @staticmethod
+    def readSeams(mesh, faceIndexes):
+        corners, faceOffsets = Trimmer.faceCorners(mesh, faceIndexes)
+        edges = Trimmer.readArray(mesh.loops, 'edge_index', np.int32)[corners]
+        seams = Trimmer.readArray(mesh.edges, 'use_seam', bool)[edges]
+
+        return Trimmer.cornerSeams(edges, seams, faceOffsets)
+
+    @classmethod
+    def editLoops(cls, obj, faceIndexes):
+        bm = cls.editMesh(obj)
+        bm.faces.ensure_lookup_table()
+        faces = [bm.faces[faceIndex] for faceIndex in faceIndexes]
+
+        faceOffsets = np.concatenate(([0], np.cumsum([len(face.loops) for face in faces])))
+        return [loop for face in faces for loop in face.loops], faceOffsets
+
+    @classmethod
+    def readEditMesh(cls, obj, faceIndexes):
+        # only the selected faces are read, the mesh data is left as it was before edit mode
+        bm = cls.editMesh(obj)
+        bm.verts.index_update()
+        bm.edges.index_update()
+        loops, faceOffsets = cls.editLoops(obj, faceIndexes)
+
+        vertexIndexes = [loop.vert.index for loop in loops]
+        meshCoords = IndexedMesh.fromCorners(vertexIndexes, [loop.vert.co[:] for loop in loops], faceOffsets)
+
+        edges = np.array([loop.edge.index for loop in loops], dtype=int)
+        seams = np.array([loop.edge.seam for loop in loops], dtype=bool)
+        return meshCoords, cls.cornerSeams(edges, seams, faceOffsets)
+
+    @classmethod
+    def readEditUvCoords(cls, obj, faceIndexes):
+        uvLayer = cls.editMesh(obj).loops.layers.uv.active
+        loops, faceOffsets = cls.editLoops(obj, faceIndexes)
+
+        return unpackPolygons(np.array([loop[uvLayer].uv[:] for loop in loops]), np.diff(faceOffsets))
+
+    @staticmethod
+    def readFaceKeys(mesh, groupBy, attributeName):
+        if groupBy == 'MATERIAL':
+            return Trimmer.readArray(mesh.polygons, 'material_index', np.int32)
+
+        attribute = mesh.attributes.get(attributeName)
+        if attribute is None or attribute.domain != 'FACE' or attribute.data_type not in ['INT', 'BOOLEAN']:
+            raise TrimmerException(f"The object does not have an integer or boolean face attribute \"{attributeName}\"!")
+
+        dtype = bool if attribute.data_type == 'BOOLEAN' else np.int32
+        return Trimmer.readArray(attribute.data, 'value', dtype).astype(np.int32)
 
     @staticmethod
     def getObject(context):
@@ -43,100 +162,222 @@ class Trimmer():
         return obj
 
     @staticmethod
-    def getNewBm(obj):
-        return bmesh.from_edit_mesh(obj.data)
+    def getObjects(context):
+        # all meshes of a multi-object edit mode, the active object first
+        obj = Trimmer.getObject(context)
+        return [obj] + [other for other in context.objects_in_mode if other.type == 'MESH' and other != obj]
+
+    @classmethod
+    def readsInBulk(cls, obj, faceCount):
+        return faceCount >= cls.bulkShare * len(cls.editMesh(obj).faces)
+
+    @classmethod
+    def readSelectedFaces(cls, obj):
+        bm = cls.editMesh(obj)
+        bm.faces.ensure_lookup_table()
+
+        # faces selected one by one are all in the selection history, their indexes are only renumbered
+        # when a topology change left them stale
+        history = {element for element in bm.select_history if isinstance(element, bmesh.types.BMFace) and element.select}
+        if len(history) == obj.data.total_face_sel:
+            if any(face.index < 0 or face.index >= len(bm.faces) or bm.faces[face.index] != face for face in history):
+                bm.faces.index_update()
+            return sorted(face.index for face in history)
+
+        # box and lasso selections are not, bmesh has no bulk read of the select flags and converting
+        # the mesh to read them from the mesh data costs several times more than walking the faces
+        return [i for i, face in enumerate(bm.faces) if face.select]
+
+    @classmethod
+    def getSelectedFaces(cls, obj):
+        selectedFaces = cls.readSelectedFaces(obj)
+        if len(selectedFaces) == 0:
+            raise TrimmerException("No face selected!")
+
+        return selectedFaces
+
+    @classmethod
+    def getSelections(cls, context):
+        selections = [(obj, cls.readSelectedFaces(obj)) for obj in cls.getObjects(context)]
+        selections = [(obj, faces) for obj, faces in selections if len(faces) > 0]
+        if len(selections) == 0:
+            raise TrimmerException("No face selected!")
+
+        return selections
 
     @staticmethod
-    def getUvLayer(bm):
-        if not bm.loops.layers.uv.items():
+    def objectError(obj, message, objectCount):
+        if objectCount > 1:
+            return TrimmerException(f"{obj.name}: {message}")
+        return TrimmerException(message)
+
+    @staticmethod
+    def getUvLayer(mesh):
+        if len(mesh.uv_layers) == 0:
             raise TrimmerException("The object does not have any UV maps!")
 
-        uvLayer = bm.loops.layers.uv.active
+        uvLayer = mesh.uv_layers.active
         if uvLayer is None:
             raise TrimmerException("The object does not have an active UV map!")
 
         return uvLayer
 
-    @staticmethod
-    def seamEdgeNeighbors(faces):
-        faceIndexMap = {face.index: i for i, face in enumerate(faces)}
-        seamEdges = set()
+    @classmethod
+    def editMesh(cls, obj):
+        bm = bmesh.from_edit_mesh(obj.data)
+        if cls.editMeshes.get(obj.name) is not bm:
+            cls.releaseEditMeshes()
+            cls.loopUvs.pop(obj.name, None)
+            cls.editMeshes[obj.name] = bm
+        return bm
 
-        for face in faces:
-            for edge in face.edges:
-                if edge.seam:
-                    seamEdges.add(edge)
+    @classmethod
+    def editLoopUvs(cls, obj, faceIndexes):
+        uvLayer = cls.editMesh(obj).loops.layers.uv.active
+        cached = cls.loopUvs.get(obj.name)
+        if cached == None or cached[0] is not faceIndexes or cached[1] != uvLayer.name:
+            loops, _ = cls.editLoops(obj, faceIndexes)
+            cached = (faceIndexes, uvLayer.name, [loop[uvLayer] for loop in loops])
+            cls.loopUvs[obj.name] = cached
 
-        neighborFaceLists = []
-        for edge in seamEdges:
-            face_list = [faceIndexMap[f.index] for f in edge.link_faces if f.index in faceIndexMap]
-            if len(face_list) > 1:
-                neighborFaceLists.append(face_list)
+        return cached[2]
+
+    @classmethod
+    def writeEditUvCoords(cls, obj, faceIndexes, uvCoords):
+        # in edit mode the UVs only live in bmesh, the mesh loops stay empty until edit mode is left, so without
+        # a mode switch every loop is assigned on its own; the UV references are looked up once per session,
+        # which leaves a rotation slider tick with the assignments alone
+        for loopUv, uv in zip(cls.editLoopUvs(obj, faceIndexes), uvCoords.tolist()):
+            loopUv.uv = uv
 
-        return neighborFaceLists
+        bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
 
     @classmethod
-    def apply(cls, context, faces, uvCoords, uvLayer, temporary = False):
-        for i in range(len(faces)):
-            for j in range(len(faces[i].loops)):
-                UVLoop = faces[i].loops[j][uvLayer]
-                coord = uvCoords[i][j]
-                UVLoop.uv = coord
+    def writeUvCoords(cls, writes, modeSwitch = True):
+        # bmesh has no bulk access to loop layers, so the selections read in bulk are written to the mesh data
+        # in object mode, every one of them during the same mode switch
+        bulkWrites = []
+        for obj, faceIndexes, loops, uvCoords in writes:
+            if modeSwitch and loops is not None:
+                bulkWrites.append((obj, loops, uvCoords))
+            else:
+                cls.writeEditUvCoords(obj, faceIndexes, uvCoords)
+
+        if len(bulkWrites) == 0:
+            return
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        try:
+            for obj, loops, uvCoords in bulkWrites:
+                uvData = cls.getUvLayer(obj.data).data
+                uvs = cls.readArray(uvData, 'uv', np.float32, 2)
+                uvs[loops] = uvCoords
+                uvData.foreach_set('uv', uvs.ravel())
+        finally:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+    @staticmethod
+    def sessionWrite(obj, session):
+        return obj, session.faceIndexes, session.loops, session.uvCoords
+
+    @classmethod
+    def apply(cls, context, writes, temporary = False, modeSwitch = True):
+        cls.writeUvCoords(writes, modeSwitch)
 
         if not temporary: 
-            cls.currentReferenceCoords = uvCoords
             context.scene.trim_options.clear()
 
     @classmethod
-    def applyFaces(cls, context, faces, trim, uvLayer):
-        meshCoords = Trim.parseMeshCoordinates(faces)
+    def fitFaces(cls, context, obj, faceIndexes, trim):
+        loops = None
+        if cls.readsInBulk(obj, len(faceIndexes)):
+            # the mesh data is read in bulk, so it has to hold the edit mode changes first
+            obj.update_from_editmode()
+            meshCoords = cls.readMeshCoords(obj.data, faceIndexes)
+            seams = cls.readSeams(obj.data, faceIndexes)
+            loops, _ = cls.faceCorners(obj.data, faceIndexes)
+        else:
+            meshCoords, seams = cls.readEditMesh(obj, faceIndexes)
 
-        seams = cls.seamEdgeNeighbors(faces)
-        flatMeshCoords = unwrap(meshCoords, seams)
+        islands = cls.unwrapHistory.unwrap(obj.name, faceIndexes, meshCoords, seams, context.scene.trim_options.separateIslands)
 
         fitOption = context.scene.trim_options.fitOptions
-        uvCoords = Trim.uvCoords(trim.getUvCoords(), flatMeshCoords, fitOption)
+        session = ApplySession(faceIndexes, meshCoords, seams, islands, trim, trim.getUvCoords(), fitOption)
+        session.loops = loops
+        session.fit()
+        return session
 
-        cls.apply(context, faces, uvCoords, uvLayer)
+    @classmethod
+    def apply_texture(cls, context, trim, modeSwitch = True):
+        selections = cls.getSelections(context)
+
+        if trim is None:
+            raise TrimmerException("Trim is null!")
+
+        sessions = []
+        for obj, selectedFaces in selections:
+            try:
+                cls.getUvLayer(obj.data)
+                sessions.append((obj, cls.fitFaces(context, obj, selectedFaces, trim)))
+            except (UnwrapException, TrimmerException) as e:
+                raise cls.objectError(obj, str(e), len(selections))
 
-        cls.currentApplyOption = fitOption
-        cls.currentFaceIndexes = [f.index for f in faces]
-        cls.flatMeshCoords = flatMeshCoords
-        cls.currentTrim = trim
+        cls.apply(context, [cls.sessionWrite(obj, session) for obj, session in sessions], modeSwitch=modeSwitch)
+        for obj, session in sessions:
+            cls.sessions[obj.name] = session
 
     @classmethod
-    def apply_texture(cls, context, trim):
-        obj = cls.getObject(context)
-        bm = cls.getNewBm(obj)
-        uvLayer = cls.getUvLayer(bm)
+    def fitGroups(cls, obj, groupTrims, options):
+        mesh = obj.data
+        obj.update_from_editmode()
 
-        selectedFaces = [face for face in bm.faces if face.select]
-        if selectedFaces is None or selectedFaces == []:
-            raise TrimmerException("No face selected!")
+        # every group is read from and written to the mesh data at once
+        faceKeys = cls.readFaceKeys(mesh, options.groupBy, options.groupAttribute)
+        faceIndexes = np.flatnonzero(np.isin(faceKeys, list(groupTrims))).tolist()
+        if len(faceIndexes) == 0:
+            return None
+        cls.getUvLayer(mesh)
 
-        if trim is None:
-            raise TrimmerException("Trim is null!")
+        meshCoords = cls.readMeshCoords(mesh, faceIndexes)
+        seams = cls.readSeams(mesh, faceIndexes)
+        corners, _ = cls.faceCorners(mesh, faceIndexes)
 
-        try:
-            cls.applyFaces(context, selectedFaces, trim, uvLayer)
-        except UnwrapException as ue:
-            raise TrimmerException(str(ue))
+        groups = groupSessions(faceIndexes, meshCoords, seams, faceKeys[faceIndexes], groupTrims, options.separateIslands)
 
-        bmesh.update_edit_mesh(obj.data)
+        groupFaces = [faceIndex for _, session in groups for faceIndex in session.faceIndexes]
+        loops = np.concatenate([corners[meshCoords.subsetCorners(positions)[0]] for positions, _ in groups])
+        uvCoords = np.concatenate([session.uvCoords for _, session in groups])
+        return obj, groupFaces, loops, uvCoords
 
     @classmethod
-    def add_trim(cls, context, trimsheet_index):
-        obj = cls.getObject(context)
-        bm = cls.getNewBm(obj)
-        uvLayer = cls.getUvLayer(bm)
+    def apply_groups(cls, context, groupTrims):
+        objects = cls.getObjects(context)
+        if len(groupTrims) == 0:
+            raise TrimmerException("No trim groups!")
 
-        selectedFaces = [face for face in bm.faces if face.select]
-        if selectedFaces is None or selectedFaces == []:
-            raise TrimmerException("No face selected!") # Error handling
+        options = context.scene.trim_options
+        groupTrims = {key: (trim, trim.getUvCoords(), fitOption) for key, (trim, fitOption) in groupTrims.items()}
 
-        face = selectedFaces[0]
+        writes = []
+        for obj in objects:
+            try:
+                writes.append(cls.fitGroups(obj, groupTrims, options))
+            except TrimmerException as te:
+                raise cls.objectError(obj, str(te), len(objects))
 
-        uvCoords = cls.uvCoordsFromFaces(face, uvLayer, single=True)
+        writes = [write for write in writes if write is not None]
+        if len(writes) == 0:
+            raise TrimmerException("No faces belong to the trim groups!")
+
+        cls.writeUvCoords(writes)
+        cls.clear(context)
+        options.clear()
+
+    @classmethod
+    def add_trim(cls, context, trimsheet_index):
+        obj = cls.getObject(context)
+        selectedFaces = cls.getSelectedFaces(obj)
+        uvCoords = cls.readEditUvCoords(obj, selectedFaces[:1])[0]
         uvCoords = compactPoints(uvCoords)
         trimsheet = context.scene.trimsheet_collection[trimsheet_index]
         trimsheet.addTrim(uvCoords)
@@ -149,34 +390,31 @@ class Trimmer():
 
     @classmethod
     def mirror_trim(cls, context):
-        obj = cls.getObject(context)
-        bm = cls.getNewBm(obj)
-        uvLayer = cls.getUvLayer(bm)
+        sessions = cls.getSessions(context)
+        for _, session in sessions:
+            session.mirror()
+        cls.apply(context, [cls.sessionWrite(obj, session) for obj, session in sessions])
 
-        faces = cls.getFacesFromIndexes(bm)
-        mirroredPoints = mirrorPoints(cls.uvCoordsFromFaces(faces, uvLayer))
-        mirroredUV = Trim.uvCoords(cls.currentTrim.getUvCoords(), mirroredPoints, cls.currentApplyOption)
-        cls.apply(context, faces, mirroredUV, uvLayer)
+    @classmethod
+    def rotate_trim(cls, context, degrees = None, modeSwitch = True):
+        sessions = cls.getSessions(context)
+        for _, session in sessions:
+            session.rotate(degrees)
+        cls.apply(context, [cls.sessionWrite(obj, session) for obj, session in sessions], temporary=True, modeSwitch=modeSwitch)
 
-        bmesh.update_edit_mesh(obj.data)
+modeOwner = object()
 
-    @classmethod
-    def rotate_trim(cls, context, degrees = None):
-        obj = cls.getObject(context)
-        bm = cls.getNewBm(obj)
-        uvLayer = cls.getUvLayer(bm)
-        faces = cls.getFacesFromIndexes(bm)
+def modeChanged():
+    Trimmer.releaseEditMeshes()
 
-        if cls.currentApplyOption == 'FILL':
-            rotatedUV = rotatePointsFill(cls.uvCoordsFromFaces(faces, uvLayer))
-        else:
-            if degrees == None:
-                raise TrimmerException(f"Parameter degrees for fit option {cls.currentApplyOption} can not be null!")
-            rotatedUnfitUV = rotatePointsFit(cls.currentReferenceCoords, degrees)
-            rotatedUV = Trim.uvCoords(cls.currentTrim.getUvCoords(), rotatedUnfitUV, cls.currentApplyOption)
+@persistent
+def subscribeModeChanges(*args):
+    # subscriptions don't survive loading a file, so they are made again after every load
+    bpy.msgbus.clear_by_owner(modeOwner)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Object, "mode"), owner=modeOwner, args=(), notify=modeChanged)
 
-        cls.apply(context, faces, rotatedUV, uvLayer, temporary=True)
-        bmesh.update_edit_mesh(obj.data)
+def unsubscribeModeChanges():
+    bpy.msgbus.clear_by_owner(modeOwner)
 
 class UVCoord(bpy.types.PropertyGroup):
     uv: bpy.props.FloatVectorProperty(size=2) # type: ignore
@@ -210,51 +448,6 @@ class Trim(bpy.types.PropertyGroup):
 
         return arr
 
-    @staticmethod 
-    def uvCoords(uvCoords, flatMeshCoords, fitOption):
-        if fitOption == 'FIT':
-            return Trim.uvCoordsForFit(uvCoords, flatMeshCoords)
-        elif fitOption == 'FIT_X':
-            return Trim.uvCoordsForFit(uvCoords, flatMeshCoords, boundByY=False)
-        elif fitOption == 'FIT_Y':
-            return Trim.uvCoordsForFit(uvCoords, flatMeshCoords, boundByX=False)
-        elif fitOption == 'FILL':
-            return Trim.uvCoordsForFill(uvCoords, flatMeshCoords)
-        else:
-            raise Exception(f"Invalid fit option: {fitOption}")
-
-    @staticmethod
-    def uvCoordsForFill(uvCoords, meshCoords):
-        boundary = boundaryVertices(meshCoords)
-
-        if len(uvCoords) != len(boundary):
-            raise TrimmerException(f"Amount of UV coords ({len(uvCoords)}) doesn't match the amount of boundary coords ({len(boundary)})!")
-
-        boundaryNormal = normal(*boundary[0:3])
-        uvCoordsNormal = normal(*uvCoords[0:3])
-        if compare(boundaryNormal, uvCoordsNormal) != 0:
-            boundary.reverse()
-
-        weights = mvcWeights(boundary, meshCoords)
-        weighted = applyMvcWeights(uvCoords, weights)
-
-        return weighted
-
-    @staticmethod
-    def uvCoordsForFit(uvCoords, meshCoords, boundByX = True, boundByY = True):
-        from .utils2D import containedPolygons
-
-        return containedPolygons(meshCoords, uvCoords, boundByX, boundByY)
-
-    @staticmethod
-    def parseMeshCoordinates(faces):
-        mesh = []
-
-        for face in faces:
-            mesh.append([loop.vert.co[:] for loop in face.loops])
-
-        return mesh
-    
 class Trimsheet(bpy.types.PropertyGroup):
     name: bpy.props.StringProperty() # type: ignore
     trims: bpy.props.CollectionProperty(type=Trim) # type: ignore
@@ -82,12 +82,15 @@ class TrimOptions(bpy.types.PropertyGroup):
 
         context.window_manager.popup_menu(draw, title="Error", icon='ERROR')
 
+    # property updates must not run operators like mode_set, so they write the UVs through bmesh
+
     def fitOptionUpdate(self, context):
-        if self.previousFitOptionValue == self.fitOptions or Trimmer.currentTrim == None:
+        session = Trimmer.activeSession(context)
+        if self.previousFitOptionValue == self.fitOptions or session == None:
             self.previousFitOptionValue = self.fitOptions
             return
         try:
-            Trimmer.apply_texture(context, Trimmer.currentTrim)
+            Trimmer.apply_texture(context, session.trim, modeSwitch=False)
             self.previousFitOptionValue = self.fitOptions
         except TrimmerException as te:
             self.fitOptions = self.previousFitOptionValue
@@ -101,10 +104,29 @@ class TrimOptions(bpy.types.PropertyGroup):
         update = fitOptionUpdate
     ) # type: ignore
 
+    def separateIslandsUpdate(self, context):
+        session = Trimmer.activeSession(context)
+        if self.updatesOff or session == None:
+            return
+        try:
+            Trimmer.apply_texture(context, session.trim, modeSwitch=False)
+        except TrimmerException as te:
+            self.updatesOff = True
+            self.separateIslands = not self.separateIslands
+            self.updatesOff = False
+            self.show_error(context, str(te))
+
+    separateIslands: bpy.props.BoolProperty(
+        name = "Separate islands",
+        description = "Unwrap every island of the selection separately and apply the trim to each of them",
+        default = False,
+        update = separateIslandsUpdate
+    ) # type: ignore
+
     def rotationUpdate(self, context):
         if self.updatesOff:
             return
-        Trimmer.rotate_trim(context, degrees = self.rotation)
+        Trimmer.rotate_trim(context, degrees = self.rotation, modeSwitch = False)
 
     rotation: bpy.props.FloatProperty(
         name = "Rotation",
@@ -113,6 +135,28 @@ class TrimOptions(bpy.types.PropertyGroup):
         update = rotationUpdate
     ) # type: ignore
 
+    groupBy: bpy.props.EnumProperty(
+        name = "Group by",
+        description = "Select how the faces are split into trim groups",
+        items = [
+            ('MATERIAL', "Material", "Group the faces by material slot"),
+            ('ATTRIBUTE', "Attribute", "Group the faces by an integer or boolean face attribute, like face maps or face sets"),
+        ],
+        default = 'MATERIAL'
+    ) # type: ignore
+
+    groupAttribute: bpy.props.StringProperty(
+        name = "Attribute",
+        description = "Name of the face attribute the faces are grouped by",
+        default = "face_maps"
+    ) # type: ignore
+
+class TrimGroup(bpy.types.PropertyGroup):
+    key: bpy.props.IntProperty(name="Group", description="Material slot index or attribute value of the faces in the group") # type: ignore
+    trimsheet_index: bpy.props.IntProperty(name="Trimsheet", min=0) # type: ignore
+    trim_index: bpy.props.IntProperty(name="Trim", min=0) # type: ignore
+    fitOptions: bpy.props.EnumProperty(name="", items=TrimOptions.items, default='FILL') # type: ignore
+
 class ApplyTrimSettings(bpy.types.Panel):
     bl_label = "Settings"
     bl_idname = "TRIMMER_PT_APPLY_TRIM_SETTINGS"
@@ -132,6 +176,7 @@ class ApplyTrimSettings(bpy.types.Panel):
         layout = self.layout
         layout.label(text="Trim fitting options:")
         layout.prop(context.scene.trim_options, "fitOptions")
+        layout.prop(context.scene.trim_options, "separateIslands")
 
     def drawFillSettings(self, context):
         layout = self.layout
@@ -157,15 +202,63 @@ class ApplyTrimSettings(bpy.types.Panel):
 
     def draw(self, context):
         self.drawFitOption(context)
-        if Trimmer.currentApplyOption == 'FILL':
+        session = Trimmer.activeSession(context)
+        fitOption = None if session == None else session.fitOption
+        if fitOption == 'FILL':
             self.drawFillSettings(context)
-        elif Trimmer.currentApplyOption in ['FIT', 'FIT_X', 'FIT_Y']:
+        elif fitOption in ['FIT', 'FIT_X', 'FIT_Y']:
             self.drawFitSettings(context)
 
     @staticmethod
-    def confirmTrim():
+    def confirmTrim(releaseMeshes = True):
         bpy.context.scene.trim_options.clear()
-        Trimmer.clear()
+        Trimmer.clear(bpy.context, releaseMeshes)
+
+class TrimGroupsUI(bpy.types.Panel):
+    bl_label = "Trim groups"
+    bl_idname = "TRIMMER_PT_TRIM_GROUPS"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Trimmer"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return ApplyTrimSettings.poll(context)
+
+    def draw(self, context):
+        layout = self.layout
+        trim_options = context.scene.trim_options
+        layout.prop(trim_options, "groupBy")
+        if trim_options.groupBy == 'ATTRIBUTE':
+            layout.prop(trim_options, "groupAttribute")
+
+        groups = context.scene.trim_groups
+        for i in range(len(groups)):
+            row = layout.row(align=True)
+            row.prop(groups[i], "key")
+            row.prop(groups[i], "trimsheet_index")
+            row.prop(groups[i], "trim_index")
+            row.prop(groups[i], "fitOptions")
+            DeleteTrimGroupButton.init(row, i)
+
+        AddTrimGroupButton.init(layout)
+        ApplyTrimGroupsButton.init(layout)
+
+    @staticmethod
+    def groupTrims(context):
+        trimsheets = context.scene.trimsheet_collection
+        groupTrims = {}
+
+        for group in context.scene.trim_groups:
+            if group.key in groupTrims:
+                raise TrimmerException(f"Group {group.key} has more than one trim!")
+            if group.trimsheet_index >= len(trimsheets) or group.trim_index >= len(trimsheets[group.trimsheet_index].trims):
+                raise TrimmerException(f"Group {group.key} references a trim that does not exist!")
+
+            groupTrims[group.key] = (trimsheets[group.trimsheet_index].trims[group.trim_index], group.fitOptions)
+
+        return groupTrims
 
 class AddTrimButton(bpy.types.Operator):
     bl_idname = "trimmer.add_trim"
@@ -238,7 +331,8 @@ class ApplyTrimButton(bpy.types.Operator):
     
     def execute(self, context):
         try:
-            ApplyTrimSettings.confirmTrim()
+            # the next trim is read right after, so the bmesh wrappers are kept for it
+            ApplyTrimSettings.confirmTrim(releaseMeshes=False)
             Trimmer.apply_texture(context, context.scene.trimsheet_collection[self.trimsheet_index].trims[self.trim_index])
             return {'FINISHED'}
         except TrimmerException as te:
@@ -388,4 +482,64 @@ class AbstractOperator(bpy.types.Operator):
             return {'FINISHED'}
         except TrimmerException as te:
             self.report({'ERROR'}, str(te))
-            return {'CANCELLED'}
\ No newline at end of file
+            return {'CANCELLED'}
+
+class AddTrimGroupButton(bpy.types.Operator):
+    bl_idname = "trimmer.add_trim_group"
+    bl_label = ""
+
+    def init(layout):
+        add_trim_group_button = layout.operator("trimmer.add_trim_group", text="Add group", icon='NONE')
+
+        return add_trim_group_button
+
+    @classmethod
+    def description(cls, context, properties):
+        return "Add a new trim group"
+
+    def execute(self, context):
+        groups = context.scene.trim_groups
+        group = groups.add()
+        group.key = len(groups) - 1
+        return {'FINISHED'}
+
+class DeleteTrimGroupButton(bpy.types.Operator):
+    bl_idname = "trimmer.delete_trim_group"
+    bl_label = ""
+
+    group_index: bpy.props.IntProperty() # type: ignore
+
+    def init(layout, index):
+        delete_trim_group_button = layout.operator("trimmer.delete_trim_group", text=None, icon='X')
+        delete_trim_group_button.group_index = index
+
+        return delete_trim_group_button
+
+    @classmethod
+    def description(cls, context, properties):
+        return "Delete the trim group"
+
+    def execute(self, context):
+        context.scene.trim_groups.remove(self.group_index)
+        return {'FINISHED'}
+
+class ApplyTrimGroupsButton(bpy.types.Operator):
+    bl_idname = "trimmer.apply_trim_groups"
+    bl_label = ""
+
+    def init(layout):
+        apply_trim_groups_button = layout.operator("trimmer.apply_trim_groups", text="Apply groups", icon='NONE')
+
+        return apply_trim_groups_button
+
+    @classmethod
+    def description(cls, context, properties):
+        return "Apply the trims of all groups to their faces"
+
+    def execute(self, context):
+        try:
+            Trimmer.apply_groups(context, TrimGroupsUI.groupTrims(context))
+            return {'FINISHED'}
+        except TrimmerException as te:
+            self.report({'ERROR'}, str(te))
+            return {'CANCELLED'}
@@ -1,3 +1,5 @@
+import numpy as np
+
 # List operations
 
 def distance(v):
@@ -54,11 +56,66 @@ def crossProduct(v1, v2):
 
 coefficient = 6
 
-def compare(a1, a2, checkType = False):
+def numericArray(a):
+    if isinstance(a, (str, bytes)):
+        return None
+    try:
+        arr = np.asarray(a)
+    except (ValueError, TypeError):
+        return None
+    if arr.dtype.kind not in 'biuf':
+        return None
+    return arr
+
+def compareArrays(a1, a2):
+    arr1 = numericArray(a1)
+    if arr1 is None:
+        return None
+    arr2 = numericArray(a2)
+    if arr2 is None or arr1.shape != arr2.shape:
+        return None
+
+    EPSILON = 10 ** -coefficient
+    x1 = arr1.astype(float).ravel()
+    x2 = arr2.astype(float).ravel()
+    difference = x1 - x2
+
+    # element results in the order the recursive comparison visits them, the first non-zero one wins
+    results = np.where(np.abs(difference) < EPSILON, 0, np.where(difference < -EPSILON, -1, np.where(difference > EPSILON, 1, np.where(x1 == x2, 0, -1))))
+    unequal = np.flatnonzero(results)
+    return int(results[unequal[0]]) if len(unequal) > 0 else 0
+
+def compareScalars(x1, x2):
     try:
-        if checkType and type(a1) != type(a2):
+        EPSILON = 10 ** -coefficient
+        difference = x1-x2
+        if abs(difference) < EPSILON:
+            return 0
+        if difference < -EPSILON:
+            return -1
+        if difference > EPSILON:
+            return 1
+        raise ArithmeticError(f"Values {x1}, {x2} don't respond to our laws of math!")
+    except:
+        if x1 == x2:
+            return 0
+        else:
             return -1
 
+def compare(a1, a2, checkType = False):
+    if checkType and type(a1) != type(a2):
+        return -1
+
+    if isinstance(a1, (int, float)) and isinstance(a2, (int, float)):
+        return compareScalars(a1, a2)
+
+    # short sequences are quicker to walk than to convert
+    if isinstance(a1, np.ndarray) or (hasattr(a1, '__len__') and len(a1) >= 8):
+        arrayCompare = compareArrays(a1, a2)
+        if arrayCompare != None:
+            return arrayCompare
+
+    try:
         if len(a1) != len(a2):
             return -1
 
@@ -73,22 +130,7 @@ def compare(a1, a2, checkType = False):
                 return -1
         return 0
     except TypeError:
-        x1, x2 = a1, a2
-        try:
-            EPSILON = 10 ** -coefficient
-            difference = x1-x2
-            if abs(difference) < EPSILON:
-                return 0
-            if difference < -EPSILON:
-                return -1
-            if difference > EPSILON:
-                return 1
-            raise ArithmeticError(f"Values {x1}, {x2} don't respond to our laws of math!")
-        except:
-            if x1 == x2:
-                return 0
-            else:
-                return -1
+        return compareScalars(a1, a2)
 
 def deepToList(arr):
     try:
@@ -148,22 +190,26 @@ def padPoints(points, limit):
 
     return type(points)([padPoints(el, limit) for el in points])
 
+def sameStructure(template, values):
+    if isinstance(template, np.ndarray):
+        return values
+    if any(hasattr(el, '__iter__') for el in template):
+        return type(template)([sameStructure(el, value) for el, value in zip(template, values)])
+    return type(template)(values.tolist())
+
 def applyMatrix(points, matrix, translation = False):
+    from .geometry import transform
+
     if not hasattr(points, '__iter__'):
         raise Exception("Parameter points must be iterable!")
 
-    if translation:
-        points = padPoints(points, len(matrix[0]))
-    
-    if not any(hasattr(el, '__iter__') for el in points):
-        result = deepToList(matrix @ points)
-    else:
-        result = ([applyMatrix(el, matrix) for el in points])
+    try:
+        values = np.asarray(points, dtype=float)
+    except ValueError:
+        # ragged lists are transformed one regular part at a time
+        return type(points)([applyMatrix(el, matrix, translation) for el in points])
 
-    if translation:
-        result = padPoints(result, len(matrix[0]) - 1)
-    
-    return type(points)(result)
+    return sameStructure(points, transform(matrix, values, translation))
 
 def normal(P1, P2, P3):
     V1 = subtract(P2, P1)
@@ -1,248 +1,200 @@
 import numpy as np
 import copy
 from .utils import *
+from .indexed_mesh import IndexedMesh
+from .geometry import asPoints, packPolygons, unpackPolygons, transform, rotationMatrix, convexHull, collinearPoints, pointInPolygon, faceNormals, rotationMatricesToFlatten, signedAreas
 
 # Boundary vertices
 
-def polygonsToEdges(polygons):
-    edges = {}
-
-    for poly in polygons:
-        for i in range(len(poly)):
-            edge = tuple(sorted((tuple(poly[i]), tuple(poly[(i + 1) % len(poly)]))))
-            if edge in edges:
-                edges[edge] += 1
-            else:
-                edges[edge] = 1
-
-    return edges
-
-def boundaryEdgeMap(boundaryEdges):
-    edgeMap = {}
-    for a, b in boundaryEdges:
-        if a not in edgeMap:
-            edgeMap[a] = []
-        if b not in edgeMap:
-            edgeMap[b] = []
-        
-        edgeMap[a].append(b)
-        edgeMap[b].append(a)
-
-    # verify edge map
-    for key in edgeMap:
-        if len(edgeMap[key]) != 2:
-            raise Exception(f"Vertex {key} has {len(edgeMap[key])} unique sides ({edgeMap[key]}), must be 2!")
-
-    return edgeMap
-
-def nextBoundaryPoint(prev, current, edgeMap):
-    neighbours = edgeMap[tuple(current)]
-    for point in neighbours:
-        if compare(point, prev) != 0:
-            return point
-    raise Exception(f"No next point for {current}")
-
-def firstBoundaryPoint(polygons, edgeMap):
-    for i in range(len(polygons)):
-        for j in range(len(polygons[i])):
-            if tuple(polygons[i][j]) in edgeMap:
-                return [i, j]
-
-def nextPolygonPoint(polygons, polygonIndex, polygonPointIndex, positiveStep = True):
-    step = 1 if positiveStep else -1
-    
-    polygon = polygons[polygonIndex]
-    return polygon[(polygonPointIndex + step) % len(polygon)]
-    
-def boundaryVertices(polygons, edges = None):
-    if edges == None:
-        edges = polygonsToEdges(polygons)
-    
-    boundaryEdges = [edge for edge in edges if edges[edge] == 1]
-    edgeMap = boundaryEdgeMap(boundaryEdges)
-
-    firstPolygonIndex, firstPolygonPointIndex = firstBoundaryPoint(polygons, edgeMap)
-    first = tuple(polygons[firstPolygonIndex][firstPolygonPointIndex])
-    boundary = [first]
-    prev = first
-    
-    second = tuple(nextPolygonPoint(polygons, firstPolygonIndex, firstPolygonPointIndex))
-    if second in edgeMap[tuple(first)]:
+def boundaryNeighbours(edges, coords):
+    vertexCount = len(coords)
+    sources = edges.ravel()
+    targets = edges[:, ::-1].ravel()
+    order = np.argsort(sources, kind='stable')
+    degrees = np.bincount(sources, minlength=vertexCount)
+
+    invalid = (degrees != 0) & (degrees != 2)
+    if np.any(invalid):
+        vertex = np.flatnonzero(invalid)[0]
+        sides = [tuple(side) for side in coords[targets[sources == vertex]].tolist()]
+        raise Exception(f"Vertex {tuple(coords[vertex].tolist())} has {len(sides)} unique sides ({sides}), must be 2!")
+
+    neighbours = np.full((vertexCount, 2), -1)
+    neighbours[sources[order[::2]]] = np.stack((targets[order[::2]], targets[order[1::2]]), axis=1)
+    return neighbours
+
+def traceBoundary(mesh, neighbourList, firstCorner):
+    face = int(np.searchsorted(mesh.faceOffsets, firstCorner, side='right')) - 1
+    start, count = mesh.faceOffsets[face], mesh.faceCounts()[face]
+    first = int(mesh.faceVertices[firstCorner])
+    second = int(mesh.faceVertices[start + (firstCorner - start + 1) % count])
+    beforeFirst = int(mesh.faceVertices[start + (firstCorner - start - 1) % count])
+
+    if second in neighbourList[first]:
         current = second
     else:
-        beforeFirst = nextPolygonPoint(polygons, firstPolygonIndex, firstPolygonPointIndex, positiveStep=False)
-        current = nextBoundaryPoint(beforeFirst, first, edgeMap)
-
-    while compare(current, first) != 0:
-        boundary.append(current)
-        prev, current = current, nextBoundaryPoint(prev, current, edgeMap)
-
-    boundary = compactPoints(boundary)
-
-    if len(boundary) < 3:
-        raise Exception(f"Boundary {boundary} is not a polygon!")
-
-    firstFace = compactPoints(polygons[0])
-    firstFaceNormal = normal(firstFace[0], firstFace[1], firstFace[2])
-    boundaryNormal = normal(boundary[0], boundary[1], boundary[2])
-    if boundaryNormal != firstFaceNormal:
-        boundary = [boundary[0]] + boundary[1:][::-1]
-    return boundary
-
-def borderingEdges(point, edges):
-    borderingEdges = []
-    for edge in edges:
-        if point in edge:
-            borderingEdges.append(edge)
-    return borderingEdges
-
-def tips(polygons, edges = None, boundary = None):
-    if edges == None:
-        edges = polygonsToEdges(polygons)
-    if boundary == None:
-        boundary = boundaryVertices(polygons, edges)
-    
-    tipPoints = []
-    for point in boundary:
-        bordering = borderingEdges(point, edges)
-        if len(bordering) < 2:
-            raise Exception(f"Vertex {point} only connected by {bordering}!")
-        elif len(bordering) == 2:
-            tipPoints.append(point)
-    
-    return tipPoints
-
-# MVC
-
-def normalise(arr):
-    newArr = []
-    s = sum(arr)
-    for a in arr:
-        newArr.append(a / s)
-    return newArr
-
-def mvcPointOnVertex(n, index):
-    arr = []
-    for i in range(n):
-        arr.append(0)
-    arr[index] = 1
-    return arr
-
-def mvcPointOnEdgeWeight(n, distance1, distance2, index1):
-    arr = []
-    for i in range(n):
-        arr.append(0)
-    
-    index2 = (index1 + 1) % n
-    dist = distance1 + distance2
-    arr[index1] = distance2 / dist
-    arr[index2] = distance1 / dist
-    return arr
-
-def mvcPointWeight(polygon, point):
-    p = np.array(point)
+        current = neighbourList[first][1] if neighbourList[first][0] == beforeFirst else neighbourList[first][0]
 
-    distances = []
-    tanThetas = []
+    boundaryIds = [first]
+    prev = first
+    while current != first:
+        boundaryIds.append(current)
+        a, b = neighbourList[current]
+        prev, current = current, (b if a == prev else a)
+
+    return boundaryIds
+
+def planarCoords(mesh):
+    # the loops are compared in the plane of the first face, so 3D input is projected into it
+    coords = np.zeros((len(mesh.coords), 3))
+    coords[:, :min(3, mesh.coords.shape[1])] = mesh.coords[:, :3]
+    points, counts = mesh.subset([0]).packed(3)
+    R = rotationMatricesToFlatten(faceNormals(points, counts))[0]
+    return transform(R, coords)[:, :2]
+
+def loopArea(planar, vertexIds):
+    return signedAreas(planar[vertexIds][None], np.array([len(vertexIds)]))[0]
+
+def orientedLoop(vertexIds, planar, referenceArea, outer):
+    # outer loops wind like the reference face, holes the other way
+    if ((loopArea(planar, vertexIds) > 0) == (referenceArea > 0)) != outer:
+        vertexIds = np.concatenate((vertexIds[:1], vertexIds[1:][::-1]))
+    return vertexIds
+
+def boundaryLoops(polygons, topology = None):
+    mesh = IndexedMesh.asIndexedMesh(polygons)
+    if topology == None:
+        topology = mesh.topology()
+    neighbours = boundaryNeighbours(topology.boundaryEdges, mesh.coords)
+    neighbourList = neighbours.tolist()
+    coords = mesh.coords.tolist()
+
+    loops = []
+    traced = [False] * len(coords)
+    for corner in np.flatnonzero(neighbours[mesh.faceVertices, 0] >= 0).tolist():
+        if traced[mesh.faceVertices[corner]]:
+            continue
+
+        boundaryIds = traceBoundary(mesh, neighbourList, corner)
+        for vertex in boundaryIds:
+            traced[vertex] = True
+
+        boundaryIds = np.array(boundaryIds)[~collinearPoints(mesh.coords[boundaryIds])]
+        if len(boundaryIds) < 3:
+            raise Exception(f"Boundary {[tuple(coords[v]) for v in boundaryIds]} is not a polygon!")
+        loops.append(boundaryIds)
+
+    if len(loops) == 0:
+        raise Exception("Mesh has no boundary!")
+
+    # loops inside an odd number of other loops are holes
+    planar = planarCoords(mesh)
+    depths = [sum(pointInPolygon(planar[loop[0]], planar[other]) for other in loops if other is not loop) for loop in loops]
+
+    firstFaceArea = loopArea(planar, mesh.face(0))
+    loops = [(orientedLoop(loop, planar, firstFaceArea, depth % 2 == 0), depth % 2 == 0) for loop, depth in zip(loops, depths)]
+    return [([tuple(coords[v]) for v in loop.tolist()], loop.tolist(), outer) for loop, outer in loops]
+
+def outline(polygons, topology = None):
+    outlines = [(loop, vertexIds) for loop, vertexIds, outer in boundaryLoops(polygons, topology) if outer]
+    if len(outlines) != 1:
+        raise Exception(f"Mesh has {len(outlines)} outlines, must be 1!")
+
+    return outlines[0]
+
+def boundaryVertices(polygons, topology = None):
+    return outline(polygons, topology)[0]
+
+def tips(polygons, topology = None, boundaryIds = None):
+    mesh = IndexedMesh.asIndexedMesh(polygons)
+    if topology == None:
+        topology = mesh.topology()
+    if boundaryIds == None:
+        _, boundaryIds = outline(mesh, topology)
+
+    tipIds = topology.tips(boundaryIds)
+
+    coords = mesh.coords.tolist()
+    return [tuple(coords[v]) for v in tipIds.tolist()]
 
-    for i in range(len(polygon)):
-        vertex = np.array(polygon[i])
-        v1 = vertex - p
-        v1Dist = np.linalg.norm(v1)
+# MVC
 
-        if compare(v1Dist, 0) == 0:
-            return mvcPointOnVertex(len(polygon), i)
+def mvcWeightMatrix(polygon, points):
+    polygon = np.asarray(polygon, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, polygon.shape[1])
+    EPSILON = 10 ** -coefficient
 
-        nextVertex = polygon[(i+1) % len(polygon)]
-        v2 = nextVertex - p
-        v2Dist = np.linalg.norm(v2)
+    toVertices = polygon[None, :, :] - points[:, None, :]
+    distances = np.linalg.norm(toVertices, axis=2)
+    nextDistances = np.roll(distances, -1, axis=1)
+    safeDistances = np.where(distances < EPSILON, 1, distances)
 
-        if compare(v2Dist, 0) == 0:
-            return mvcPointOnVertex(len(polygon), (i+1) % len(polygon))
-        cos = np.dot(np.array(v1), np.array(v2)) / (v1Dist * v2Dist)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = np.sum(toVertices * np.roll(toVertices, -1, axis=1), axis=2) / (distances * nextDistances)
+        tanThetas = np.tan(np.arccos(np.clip(cos, -1, 1)) / 2)
+        weights = (np.roll(tanThetas, 1, axis=1) + tanThetas) / safeDistances
+        weights /= np.sum(weights, axis=1, keepdims=True)
 
-        if compare(cos, -1) == 0:
-            return mvcPointOnEdgeWeight(len(polygon), v1Dist, v2Dist, i)
+    # points on an edge are interpolated linearly between its ends, points on a vertex take it as is
+    onVertex = distances < EPSILON
+    onEdge = np.abs(cos + 1) < EPSILON
+    edgeRows = np.flatnonzero(np.any(onEdge, axis=1) & ~np.any(onVertex, axis=1))
+    vertexRows = np.flatnonzero(np.any(onVertex, axis=1))
 
-        theta = np.arccos(np.dot(v1, v2) / (v1Dist * v2Dist))
+    edges = np.argmax(onEdge[edgeRows], axis=1)
+    nextEdges = (edges + 1) % len(polygon)
+    edgeDistances = distances[edgeRows, edges] + distances[edgeRows, nextEdges]
+    weights[edgeRows] = 0
+    weights[edgeRows, edges] = distances[edgeRows, nextEdges] / edgeDistances
+    weights[edgeRows, nextEdges] = distances[edgeRows, edges] / edgeDistances
 
-        distances.append(v1Dist)
-        tanThetas.append(np.tan(theta / 2))
+    weights[vertexRows] = 0
+    weights[vertexRows, np.argmax(onVertex[vertexRows], axis=1)] = 1
 
-    weight = []
-    for i in range(len(polygon)):
-        prevTan = tanThetas[(i-1) % len(tanThetas)]
-        tan = tanThetas[i]
-        w = (prevTan + tan) / distances[i]
-        weight.append(w)
+    return weights
 
-    return normalise(weight)
+def splitRows(rows, counts):
+    return np.split(rows, np.cumsum(counts)[:-1]) if len(counts) > 0 else []
 
 def mvcWeights(polygon, points):
-    weights = []
-    for point in points:
-        try:
-            iterator = iter(point[0])
-            weights.append(mvcWeights(polygon, point))
-        except:
-            weights.append(mvcPointWeight(polygon, point))
-
-    return deepToList(weights)
-
-def applyMvcWeight(polygon, weights):
-    newX = 0
-    newY = 0
-    
-    for i in range(len(polygon)):
-        x, y = polygon[i]
-        
-        newX += weights[i] * np.array(x)
-        newY += weights[i] * np.array(y)
+    if isinstance(points, IndexedMesh):
+        return points.withCoords(mvcWeightMatrix(polygon, points.coords))
+    if len(points) == 0:
+        return []
+    if not hasattr(points[0][0], '__iter__'):
+        return mvcWeightMatrix(polygon, points).tolist()
 
-    return [float(newX), float(newY)]
+    counts = [len(face) for face in points]
+    weights = mvcWeightMatrix(polygon, [point for face in points for point in face])
+    return [faceWeights.tolist() for faceWeights in splitRows(weights, counts)]
 
 def applyMvcWeights(polygon, weights):
-    if not hasattr(weights[0], '__iter__'):
-        return applyMvcWeight(polygon, weights)
-
-    newPositions = []    
-    for i in range(len(weights)):
-        newPositions.append(applyMvcWeights(polygon, weights[i]))
-    
-    return newPositions
+    polygon = np.array([tuple(vertex) for vertex in polygon], dtype=float)
+    if isinstance(weights, IndexedMesh):
+        return weights.withCoords(weights.coords @ polygon)
+    if not hasattr(weights[0], '__iter__') or not hasattr(weights[0][0], '__iter__'):
+        return (np.asarray(weights) @ polygon).tolist()
+
+    counts = [len(faceWeights) for faceWeights in weights]
+    positions = np.array([row for faceWeights in weights for row in faceWeights]) @ polygon
+    return [facePositions.tolist() for facePositions in splitRows(positions, counts)]
+
+def mirrorMvcWeights(weights):
+    # walking the boundary the other way round reflects the filled points
+    if isinstance(weights, IndexedMesh):
+        return weights.withCoords(weights.coords[:, ::-1])
+    return [[pointWeights[::-1] for pointWeights in faceWeights] for faceWeights in weights]
 
 # Polygon containment
 
 def minMaxCoords(points):
-    minX, minY = points[0]
-    maxX, maxY = points[0]
-    for point in points:
-        if point[0] < minX:
-            minX = point[0]
-        elif point[0] > maxX:
-            maxX = point[0]
-        if point[1] < minY:
-            minY = point[1]
-        elif point[1] > maxY:
-            maxY = point[1]
-    return [minX, minY, maxX, maxY]
+    points = asPoints(points)[:, :2]
+    return points.min(axis=0).tolist() + points.max(axis=0).tolist()
 
 def minMaxCoordsPolygons(polygons):
-    minX, minY = polygons[0][0]
-    maxX, maxY = polygons[0][0]
-
-    for polygon in polygons:
-        currentMinMax = minMaxCoords(polygon)
-        if currentMinMax[0] < minX:
-            minX = currentMinMax[0]
-        if currentMinMax[1] < minY:
-            minY = currentMinMax[1]
-        if currentMinMax[2] > maxX:
-            maxX = currentMinMax[2]
-        if currentMinMax[3] > maxY:
-            maxY = currentMinMax[3]
-
-    return [minX, minY, maxX, maxY]
+    if isinstance(polygons, IndexedMesh):
+        return minMaxCoords(polygons.coords)
+    return minMaxCoords(packPolygons(polygons)[0])
 
 def containmentMatrix(innerPolygons, outerPolygon, boundByX = True, boundByY = True):
     if not boundByX and not boundByY:
@@ -277,18 +229,13 @@ def containmentMatrix(innerPolygons, outerPolygon, boundByX = True, boundByY = T
 
     return T
 
-def transformPolygons(polygons, matrix):
-    paddedPolygons = padPoints(polygons, len(matrix[0]))
-    newPolygons = []
-    for i in range(len(paddedPolygons)):
-        newPolygons.append([])
-        for vertex in paddedPolygons[i]:
-            newPolygons[i].append(deepToList(matrix @ np.array(vertex)))
-    return padPoints(newPolygons, len(matrix[0]) - 1)
-
 def containedPolygons(innerPolygons, outerPolygon, boundByX = True, boundByY = True):
     matrix = containmentMatrix(innerPolygons, outerPolygon, boundByX, boundByY)
-    return roundList(deepToList(transformPolygons(innerPolygons, matrix)))
+    if isinstance(innerPolygons, IndexedMesh):
+        return innerPolygons.withCoords(np.round(transform(matrix, innerPolygons.coords[:, :2], translation=True), coefficient))
+
+    points, counts = packPolygons(innerPolygons)
+    return unpackPolygons(np.round(transform(matrix, points, translation=True), coefficient), counts)
 
 def containedPolygon(innerPolygon, outerPolygon, boundByX = True, boundByY = True):
     return containedPolygons([innerPolygon], outerPolygon, boundByX, boundByY)[0]
@@ -320,13 +267,32 @@ def rotatePointsFill(points, step=1):
     return applyMvcWeights(rotatedBoundary, weights)
 
 def rotatePointsFit(points, degrees):
-    radians = np.radians(degrees)
-    sinTheta = np.sin(radians)
-    cosTheta = np.cos(radians)
-
-    R = np.array([
-        [cosTheta, -sinTheta],
-        [sinTheta,  cosTheta]
-    ])
-
-    return applyMatrix(points, R)
\ No newline at end of file
+    return applyMatrix(points, rotationMatrix(degrees))
+
+class RotatedFit():
+    def __init__(self, polygons):
+        if isinstance(polygons, IndexedMesh):
+            self.points, self.counts = polygons.coords[polygons.faceVertices], polygons.faceCounts()
+        else:
+            self.points, self.counts = packPolygons(polygons)
+        self.points = self.points[:, :2]
+        self.hull = convexHull(self.points)
+        self.base = np.eye(2)
+
+    def mirror(self, degrees = 0):
+        # the rotation is kept, the mirrored points are the new unrotated points
+        self.base = np.diag((-1.0, 1.0)) @ rotationMatrix(degrees) @ self.base
+
+    def matrix(self, outerPolygon, degrees, boundByX = True, boundByY = True):
+        # the rotated hull has the same bounding box as all the rotated points
+        R = np.eye(3)
+        R[:2, :2] = rotationMatrix(degrees) @ self.base
+        hull = transform(R[:2, :2], self.hull)
+        return containmentMatrix([hull], outerPolygon, boundByX, boundByY) @ R
+
+    def cornerCoords(self, outerPolygon, degrees, boundByX = True, boundByY = True):
+        matrix = self.matrix(outerPolygon, degrees, boundByX, boundByY)
+        return np.round(transform(matrix, self.points, translation=True), coefficient)
+
+    def polygons(self, outerPolygon, degrees, boundByX = True, boundByY = True):
+        return unpackPolygons(self.cornerCoords(outerPolygon, degrees, boundByX, boundByY), self.counts)
@@ -1,6 +1,10 @@
 from src.utils import add, subtract, multiply, applyMatrix, compare, roundList, pointIsCollinear, compactPoints, padPoints
-from src.utils2D import boundaryVertices, mvcWeights, applyMvcWeights, containedPolygon, containedPolygons, mirrorPoints, rotatePointsFill, rotatePointsFit
-from src.multiple_face_unwrap import unwrap, UnwrapException
+from src.utils2D import boundaryVertices, boundaryLoops, tips, mvcWeights, applyMvcWeights, mirrorMvcWeights, containedPolygon, containedPolygons, minMaxCoordsPolygons, mirrorPoints, rotatePointsFill, rotatePointsFit, RotatedFit
+from src.indexed_mesh import IndexedMesh
+from src.geometry import convexHull, transform, transformBatch, translationRotationMatrices, packPolygons, unpackPolygons, signedAreas, collinearPoints
+from src.multiple_face_unwrap import seamPairs, faceHashes, unwrap, unwrapIslands, graphOfFaces, islandLabels, UnwrapException, UnwrapCache, UnwrapLayout
+from src.apply_session import ApplySession, UnwrapRecord, UnwrapHistory, TrimmerException, fillWeights, groupSeams, groupSessions
+from src.headless import readTrimsheet, groupKeys, trimUvs, ObjMesh, PlyMesh
 
 # Testing utilities
 
@@ -87,6 +91,12 @@ def testUtils():
     test(compare, [[1, 2, 3], [1, 2, 4]], -1)
     test(compare, [[[], 2, [[0], 5]], [[], 2, [[0], 5]]], 0)
     test(compare, [[[], 2, [[1], 5]], [[], 2, [[0], 5]]], 1)
+    strip = [[(i, 0), (i + 1, 0)] for i in range(1000)]
+    test(compare, [strip, [[(x + 1e-7, y) for x, y in edge] for edge in strip]], 0)
+    test(compare, [strip, strip[:500] + [[(500, 0), (501, 1)]] + strip[501:]], -1)
+    test(compare, [strip[:500] + [[(500, 0), (501, 1)]] + strip[501:], strip], 1)
+    test(compare, [[0] * 10, [0] * 9 + [None]], -1)
+    test(compare, [[0] * 10, tuple([0] * 10), True], -1)
 
     # roundList
     test(roundList, [1], 1)
@@ -120,6 +130,58 @@ def testUtils():
 
     runApplyMatrixTest()
 
+# indexed_mesh
+
+def testIndexedMesh():
+    polygons = [
+        [(0, 0), (0, 1), (1, 1), (1, 0)],
+        [(1, 1), (2, 1), (2, 0), (1, 0)]
+    ]
+    mesh = IndexedMesh.fromPolygons(polygons)
+    test(None, mesh.coords, [(0, 0), (0, 1), (1, 1), (1, 0), (2, 1), (2, 0)])
+    test(None, mesh.faceVertices, [0, 1, 2, 3, 2, 4, 5, 3])
+    test(None, mesh.faceOffsets, [0, 4, 8])
+    test(None, mesh.toPolygons(), polygons)
+    test(None, mesh.subset([1]).toPolygons(), [polygons[1]])
+    test(None, mesh.subsetCorners([1, 0]), ([4, 5, 6, 7, 0, 1, 2, 3], [0, 4, 8]))
+    test(None, mesh.nextCorners(), [1, 2, 3, 0, 5, 6, 7, 4])
+
+    topology = mesh.topology()
+    test(None, topology.edges, [[0, 1], [1, 2], [2, 3], [3, 0], [2, 4], [4, 5], [5, 3]])
+    test(None, topology.edgeFaceCounts, [1, 1, 2, 1, 1, 1, 1])
+    test(None, topology.valences, [2, 2, 3, 3, 2, 2])
+    test(None, topology.onBoundary, [True] * 6)
+    test(None, topology.tips([0, 1, 2, 4, 5, 3]), [0, 1, 4, 5])
+
+    points, counts = IndexedMesh.fromPolygons([[(0, 0), (0, 1), (1, 0)], polygons[1]]).packed(3)
+    test(None, points, [[(0, 0, 0), (0, 1, 0), (1, 0, 0), (0, 0, 0)], [(1, 1, 0), (2, 1, 0), (2, 0, 0), (1, 0, 0)]])
+    test(None, counts, [3, 4])
+
+    mesh = IndexedMesh.fromCorners([7, 3, 5, 3, 5, 9], [(0, 0), (0, 1), (1, 0), (0, 1), (1, 0), (1, 1)], [0, 3, 6])
+    test(None, mesh.faceVertices, [2, 0, 1, 0, 1, 3])
+    test(None, mesh.coords, [(0, 1), (1, 0), (0, 0), (1, 1)])
+
+# geometry
+
+def testGeometry():
+    import numpy as np
+    square = [[0, 0], [0, 1], [1, 1], [1, 0]]
+    translation = np.array([[1, 0, 1], [0, 1, 1], [0, 0, 1]])
+    test(transform, [[[0, -1], [1, 0]], square], [[0, 0], [-1, 0], [-1, 1], [0, 1]])
+    test(transform, [translation, square, True], [[1, 1], [1, 2], [2, 2], [2, 1]])
+    test(transform, [translation, [[[0, 0]], [[1, 1]]], True], [[[1, 1]], [[2, 2]]])
+
+    points, counts = packPolygons([square, square[:3]])
+    test(None, counts, [4, 3])
+    test(unpackPolygons, [points, counts], [square, square[:3]])
+    test(signedAreas, [np.array([square, square[:3] + [[0, 0]]]), counts], [-1, -0.5])
+    test(collinearPoints, [[(0, 0), (1, 2), (2, 4), (2, 3), (2, 0), (1, 0)]], [False, True, False, True, False, True])
+    test(convexHull, [[(0, 0), (1, 2), (2, 4), (1, 1), (2, 3), (2, 0), (1, 0)]], [(0, 0), (2, 0), (2, 4)])
+
+    matrices = translationRotationMatrices(np.array([[0, 0]]), np.array([[1, 0]]), np.array([[2, 2]]), np.array([[2, 3]]))
+    test(transformBatch, [matrices, np.array([[1, 0]])], [[2, 3]])
+    test(transformBatch, [matrices, np.array([square])], [[[2, 2], [1, 2], [1, 3], [2, 3]]])
+
 # utils2D
 
 def runBoundaryVerticesTest():
@@ -176,6 +238,38 @@ def runBoundaryVerticesTest():
         ], 
         [(0, 0), (3, 0), (3, 3), (0, 3)]
     )
+    testBoundaryVertices(
+        IndexedMesh([(0, 0), (0, 1), (1, 1), (1, 0), (1, 1), (1, 0), (2, 1), (2, 0)], [0, 1, 2, 3, 4, 6, 7, 5], [0, 4, 8]).subset([0]),
+        [(0, 0), (0, 1), (1, 1), (1, 0)]
+    )
+    testBoundaryVertices(
+        [[(i, 0), (i + 1, 0), (i + 1, 1), (i, 1)] for i in range(5000)],
+        [(0, 0), (5000, 0), (5000, 1), (0, 1)]
+    )
+
+    ring = [[(i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1)] for i in range(3) for j in range(3) if (i, j) != (1, 1)]
+    test(tips, [ring], [(0, 0), (3, 0), (3, 3), (0, 3)])
+    test(tips, [[[(0, 0), (1, 0), (0, 1)], [(1, 0), (1, 1), (0, 1)]]], [(0, 0), (1, 1)])
+    testBoundaryVertices(ring, [(0, 0), (3, 0), (3, 3), (0, 3)])
+    test(tips, [IndexedMesh([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)], [0, 1, 2, 3], [0, 4])], [(0, 0), (1, 0), (1, 1), (0, 1)])
+    test(boundaryLoops, [ring], [([(0, 0), (3, 0), (3, 3), (0, 3)], [0, 12, 15, 7], True), ([(1, 1), (1, 2), (2, 2), (2, 1)], [2, 4, 10, 9], False)])
+    test(boundaryVertices, [[[(0, 1), (1, 1), (1, 2), (0, 2)], [(1, 1), (2, 1), (2, 2), (1, 2)], [(1, 0), (2, 0), (2, 1), (1, 1)]]], [(0, 1), (1, 1), (1, 0), (2, 0), (2, 2), (0, 2)])
+    test(boundaryLoops, [[[(x, 0, y) for x, y in face] for face in ring]], [([(0, 0, 0), (3, 0, 0), (3, 0, 3), (0, 0, 3)], [0, 12, 15, 7], True), ([(1, 0, 1), (1, 0, 2), (2, 0, 2), (2, 0, 1)], [2, 4, 10, 9], False)])
+    test(boundaryLoops, [ring[:1] + [[(5, 5), (6, 5), (6, 6), (5, 6)]]], [([(0, 0), (1, 0), (1, 1), (0, 1)], [0, 1, 2, 3], True), ([(5, 5), (6, 5), (6, 6), (5, 6)], [4, 5, 6, 7], True)])
+
+    try:
+        boundaryVertices(ring[:1] + [[(5, 5), (6, 5), (6, 6), (5, 6)]])
+        raise Exception("Error test failed: boundaryVertices with two outlines")
+    except Exception as e:
+        if "outlines" not in str(e):
+            raise e
+
+    try:
+        boundaryVertices([[(0, 0), (1, 0), (1, 1)], [(1, 1), (2, 1), (2, 2)]])
+        raise Exception("Error test failed: boundaryVertices with a vertex shared by two boundaries")
+    except Exception as e:
+        if not str(e).startswith("Vertex (1.0, 1.0) has 4 unique sides"):
+            raise e
 
 def runMVCTest():
     def testMVC(oldPolygon, inputPoints, newPolygon, outputPoints):
@@ -203,6 +297,14 @@ def runMVCTest():
         [[(0, 0), (0, 4), (3, 2), (6, 4), (6, 0)], [(6, 4), (15, 4), (15, 0), (6, 0)]]
     )
 
+    mesh = IndexedMesh.fromPolygons([[(0, 0), (0, 2), (1, 1), (2, 2), (2, 0)], [(2, 2), (5, 2), (5, 0), (2, 0)]])
+    weights = mvcWeights([(0, 0), (0, 2), (5, 2), (5, 0)], mesh)
+    test(None, weights.faceVertices, mesh.faceVertices)
+    test(None, applyMvcWeights([(0, 0), (0, 4), (15, 4), (15, 0)], weights).toPolygons(), [[(0, 0), (0, 4), (3, 2), (6, 4), (6, 0)], [(6, 4), (15, 4), (15, 0), (6, 0)]])
+    test(None, mvcWeights([(0, 0), (0, 1), (1, 1), (1, 0)], [(0.25, 0), (0, 1)]), [[0.75, 0, 0, 0.25], [0, 1, 0, 0]])
+    test(mirrorMvcWeights, [[[[0.75, 0, 0, 0.25], [0, 1, 0, 0]]]], [[[0.25, 0, 0, 0.75], [0, 0, 1, 0]]])
+    test(None, applyMvcWeights([(15, 0), (15, 4), (0, 4), (0, 0)], mirrorMvcWeights(weights)).toPolygons(), [[(0, 0), (0, 4), (3, 2), (6, 4), (6, 0)], [(6, 4), (15, 4), (15, 0), (6, 0)]])
+
 def runPolygonContainmentTest():
     test(
         containedPolygon, 
@@ -234,6 +336,12 @@ def runPolygonContainmentTest():
         [[[[0, 0], [1, 0], [1, 1], [0, 1]]], [[0, 0], [5, 0], [5, 1], [0, 1]], True, False],
         [[[0, 0], [5, 0], [5, 5], [0, 5]]]
     )
+    test(
+        lambda *args: containedPolygons(*args).toPolygons(),
+        [IndexedMesh.fromPolygons([[(1, 1), (2, 1), (2, 2)], [(2, 1), (3, 1), (3, 2), (2, 2)]]), [(0, 0), (0, 1), (4, 1), (4, 0)]],
+        [[(0, 0), (1, 0), (1, 1)], [(1, 0), (2, 0), (2, 1), (1, 1)]]
+    )
+    test(minMaxCoordsPolygons, [[[(3, 0), (3, 3)], [(6, -1), (5, 1), (4, 4)]]], [3, -1, 6, 4])
 
 def testUtils2D():
     runBoundaryVerticesTest()
@@ -267,6 +375,11 @@ def testUtils2D():
     ]
     test(rotatePointsFit, [polygon, 45], expected)
 
+    trim = [(0, 0), (0, 1), (3, 1), (3, 0)]
+    for degrees in [0, 45, 90, 200]:
+        for bounds in [(True, True), (True, False), (False, True)]:
+            test(RotatedFit(polygon).polygons, [trim, degrees, *bounds], containedPolygons(rotatePointsFit(polygon, degrees), trim, *bounds))
+
 # multiple_face_unwrap
 
 def testUnwrap(inputArr, outputArr, seams = []):
@@ -281,7 +394,96 @@ def testUnwrapFail(inputArr):
     except UnwrapException as ue:
         pass
 
+def runGraphOfFacesTest():
+    mesh = [
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+        [(1, 0, 0), (2, 0, 0), (2, 1, 0), (1, 1, 0)],
+        [(2, 0, 0), (3, 0, 0), (3, 1, 0), (2, 1, 0)],
+        [(5, 5, 5), (6, 5, 5), (6, 6, 5)]
+    ]
+    def testGraphOfFaces(inputMesh, seams, output):
+        result = graphOfFaces(inputMesh, seams)
+        if result != output:
+            raise Exception(f"Graph of faces test failed: \ngraphOfFaces({inputMesh}, {seams}) = {result} \n!= \n{output}")
+
+    testGraphOfFaces(mesh, [], [{1: [(1, 2)]}, {0: [(3, 0)], 2: [(1, 2)]}, {1: [(3, 0)]}, {}])
+    testGraphOfFaces(mesh, [(1, 2)], [{1: [(1, 2)]}, {0: [(3, 0)]}, {}, {}])
+
+    test(islandLabels, [graphOfFaces(mesh)], [0, 0, 0, 1])
+    test(islandLabels, [graphOfFaces(mesh, [(1, 2)])], [0, 0, 1, 2])
+    test(islandLabels, [[]], [])
+
+    strip = [[(i, 0, 0), (i + 1, 0, 0), (i + 1, 1, 0), (i, 1, 0)] for i in range(5000)]
+    test(islandLabels, [graphOfFaces(strip)], [0] * len(strip))
+
+def runUnwrapCacheTest():
+    mesh = IndexedMesh.fromPolygons([[(0, 0, 0), (1, 0, 0), (1, 1, 0)], [(1, 0, 0), (2, 0, 0), (1, 1, 0)]])
+    key = UnwrapCache.key([4, 7], mesh, [], False)
+    test(None, UnwrapCache.key([4, 7], mesh, [], False), key)
+    test(None, UnwrapCache.key([7, 4], mesh, [], False) != key, True)
+    test(None, UnwrapCache.key([4, 7], mesh, [(1, 0)], False) != key, True)
+    test(None, UnwrapCache.key([4, 7], mesh, [], True) != key, True)
+    test(seamPairs, [[[1, 0], [0, 1, 2], [3, 3]]], [(0, 1), (0, 2), (1, 2)])
+    test(None, UnwrapCache.key([4, 7], mesh, [[0, 1], [0, 1, 2]], False), UnwrapCache.key([4, 7], mesh, [(1, 2), (0, 2), (0, 1)], False))
+    test(None, UnwrapCache.key([4, 7], mesh.withCoords(mesh.coords + 0.001), [], False) != key, True)
+
+    cache = UnwrapCache(maxSize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    test(None, cache.get("a"), 1)
+    cache.put("c", 3)
+    test(None, cache.get("b") == None, True)
+    test(None, [cache.get("a"), cache.get("c")], [1, 3])
+
+def runUnwrapIncrementalTest():
+    strip = [[(i, 0, 0), (i + 1, 0, 0), (i + 1, 1, 0), (i, 1, 0)] for i in range(4)]
+    bent = strip[:3] + [[(3, 0, 0), (3, 0, -1), (3, 1, -1), (3, 1, 0)]]
+    previous = UnwrapLayout.unwrap(strip[:3])
+    test(None, previous.flatMesh.toPolygons(), unwrap(strip[:3]))
+
+    def grown(mesh, added = [], removed = [], seams = []):
+        return previous.grow(mesh, added, removed, seams).flatMesh.toPolygons()
+
+    test(grown, [strip, [3]], unwrap(strip))
+    test(grown, [bent, [3]], unwrap(bent))
+    test(grown, [strip[1:3], [], [0]], unwrap(strip[:3])[1:])
+    replaced = strip[:2] + [[(2, 0, 0), (2, 0, -1), (2, 1, -1), (2, 1, 0)]]
+    test(grown, [replaced, [2], [2]], unwrap(replaced))
+    test(None, previous.grow(strip, [3]).grow(strip[:3], [], [3]).flatMesh.toPolygons(), unwrap(strip[:3]))
+
+    # the kept faces keep their welded vertices, the added ones are welded to them, unused ones are dropped
+    flatMesh = previous.grow(strip, [3]).flatMesh
+    test(None, [len(flatMesh.coords), len(previous.grow(strip[:2], [], [2]).flatMesh.coords)], [10, 6])
+
+    # a face that doesn't touch the kept ones, a face behind a seam or removing the middle of the strip leaves two islands
+    for mesh, added, removed, seams in [
+        (strip[:2] + [[(5, 0, 0), (6, 0, 0), (6, 1, 0), (5, 1, 0)]], [2], [2], []),
+        (strip, [3], [], [(2, 3)]),
+        ([strip[0], strip[2]], [], [1], [])
+    ]:
+        try:
+            previous.grow(mesh, added, removed, seams)
+            raise Exception(f"Error test failed: growing into {mesh} should leave two islands")
+        except UnwrapException as ue:
+            test(None, "more than 1 islands" in str(ue), True)
+
+    try:
+        previous.grow(strip, [2, 3])
+        raise Exception("Error test failed: growing with mismatching face counts")
+    except UnwrapException:
+        pass
+
+    hashes = faceHashes(strip)
+    test(None, len(set(hashes.tolist())), 4)
+    test(None, faceHashes(strip[:2] + bent[3:]).tolist(), hashes[:2].tolist() + faceHashes(bent)[3:].tolist())
+    test(None, faceHashes([[(0, -0.0, 0), (1, 0, 0), (1, 1, 0)]]).tolist(), faceHashes([[(0, 0, 0), (1, 0, 0), (1, 1, 0)]]).tolist())
+    test(None, faceHashes([[(1, 0, 0), (1, 1, 0), (0, 0, 0)]]).tolist() != faceHashes([[(0, 0, 0), (1, 0, 0), (1, 1, 0)]]).tolist(), True)
+
 def testUnwrapping():
+    runGraphOfFacesTest()
+    runUnwrapCacheTest()
+    runUnwrapIncrementalTest()
+
     testUnwrap(
         [[(-1, -1, 0), (-1, 1, 0), (1, 1, 0), (1, -1, 0)]], 
         [[(-1, 1), (-1, -1), (1, -1), (1, 1)]]
@@ -413,6 +615,226 @@ def testUnwrapping():
     seams = [(1, 2), (1, 3), (1, 5), (2, 4), (3, 4), (3, 5), (4, 5)]
     testUnwrap(cube, unwrapped, seams)
 
+    test(
+        unwrapIslands,
+        [[
+            [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],
+            [(0, 0, 1), (0, 1, 1), (1, 1, 1), (1, 0, 1)],
+            [(1, 0, 0), (1, 1, 0), (2, 1, 0), (2, 0, 0)]
+        ]],
+        [
+            ([0, 2], [[(0, 0), (0, -1), (1, -1), (1, 0)], [(1, 0), (1, -1), (2, -1), (2, 0)]]),
+            ([1], [[(0, 0), (0, -1), (1, -1), (1, 0)]])
+        ]
+    )
+    coincident = IndexedMesh(
+        [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0), (1, 1, 0), (1, 0, 0), (2, 1, 0), (2, 0, 0)],
+        [0, 1, 2, 3, 4, 6, 7, 5],
+        [0, 4, 8]
+    )
+    test(None, [faceIndexes for faceIndexes, _ in unwrapIslands(coincident)], [[0], [1]])
+    welded = unwrap(IndexedMesh.fromPolygons(coincident.toPolygons()))
+    test(None, welded.toPolygons(), [[(0, 0), (0, -1), (1, -1), (1, 0)], [(1, -1), (2, -1), (2, 0), (1, 0)]])
+    test(None, welded.faceVertices, [0, 1, 2, 3, 2, 4, 5, 3])
+    test(None, unwrap(IndexedMesh.fromPolygons(cube), seams).toPolygons(), unwrapped)
+    test(None, len(unwrap(IndexedMesh.fromPolygons(cube), seams).coords), 14)
+
+    try:
+        unwrapIslands([])
+        raise Exception("Error test failed: unwrapIslands([])")
+    except UnwrapException:
+        pass
+
+# apply_session
+
+def filledUvCoords(uvCoords, flatMeshCoords):
+    weights, target, _ = fillWeights(uvCoords, flatMeshCoords)
+    return IndexedMesh.asPolygons(applyMvcWeights(target, weights))
+
+def testApplySession():
+    strip = [[(i, 0, 0), (i + 1, 0, 0), (i + 1, 1, 0), (i, 1, 0)] for i in range(3)]
+    mesh = IndexedMesh.fromPolygons(strip[:2])
+    flat = unwrap(mesh)
+    islands = [([0, 1], flat)]
+
+    fillTrim = [(0, 0), (2, 0), (2, 1), (0, 1)]
+    session = ApplySession([5, 7], mesh, [], islands, None, fillTrim, 'FILL')
+    session.fit()
+    filled = session.uvPolygons()
+    test(None, filled, filledUvCoords(fillTrim, flat))
+    test(None, session.uvCoords.shape, (8, 2))
+    session.rotate()
+    test(None, session.uvPolygons(), filledUvCoords(fillTrim[1:] + fillTrim[:1], flat))
+    test(None, session.referenceCoords, packPolygons(filled)[0])
+    session.mirror()
+    test(None, session.uvPolygons(), filledUvCoords(fillTrim, mirrorPoints(filled)))
+    session.mirror()
+    test(None, session.uvPolygons(), filled)
+
+    clockwiseTrim = fillTrim[::-1]
+    session = ApplySession([5, 7], mesh, [], islands, None, clockwiseTrim, 'FILL')
+    session.fit()
+    filled = session.uvPolygons()
+    session.rotate()
+    test(None, session.uvPolygons(), rotatePointsFill(filled))
+    session.mirror()
+    mirrored = session.uvPolygons()
+    session.rotate()
+    test(None, session.uvPolygons(), rotatePointsFill(mirrored))
+
+    # a FILL mirror of a block wider than it is high flips the trim vertically, not along its diagonal
+    block = IndexedMesh.fromPolygons([[(i, j, 0), (i + 1, j, 0), (i + 1, j + 1, 0), (i, j + 1, 0)] for i in range(3) for j in range(2)])
+    blockFaces = list(range(len(block)))
+    session = ApplySession(blockFaces, block, [], [(blockFaces, unwrap(block))], None, [(0, 0), (1, 0), (1, 1), (0, 1)], 'FILL')
+    session.fit()
+    filled = session.uvPolygons()
+    session.mirror()
+    test(None, session.uvPolygons(), [[(u, 1 - v) for u, v in face] for face in filled])
+    test(None, filled[0], [(0, 0), (1 / 3, 0), (1 / 3, 0.5), (0, 0.5)])
+
+    # the boundary of this L starts at (2, 1) and turns at the reflex corner (1, 1)
+    corner = unwrap(IndexedMesh.fromPolygons([
+        [(2, 1, 0), (1, 1, 0), (1, 0, 0), (2, 0, 0)],
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+        [(0, 1, 0), (1, 1, 0), (1, 2, 0), (0, 2, 0)]
+    ]))
+    cornerTrim = [(2, 1), (1, 2), (0, 2), (0, 0), (1, 0), (2, 0)]
+    test(None, boundaryVertices(corner)[:3], [(2, 1), (1, 1), (1, 2)])
+    test(None, filledUvCoords(cornerTrim, corner)[0], [(2, 1), (1, 2), (1.5, 0), (2, 0)])
+
+    fitTrim = [(0, 0), (2, 0), (2, 1), (0, 1)]
+    session = ApplySession([5, 7], mesh, [], islands, None, fitTrim, 'FIT')
+    session.fit()
+    fitted = session.uvPolygons()
+    test(None, fitted, containedPolygons(flat.toPolygons(), fitTrim))
+    session.rotate(90)
+    test(None, session.uvPolygons(), containedPolygons(rotatePointsFit(fitted, 90), fitTrim))
+    test(None, session.referenceCoords, packPolygons(fitted)[0])
+    mirrored = containedPolygons(mirrorPoints(session.uvPolygons()), fitTrim)
+    session.mirror()
+    test(None, session.uvPolygons(), mirrored)
+    test(None, session.referenceCoords, packPolygons(mirrored)[0])
+    session.rotate(90)
+    rotated = session.uvPolygons()
+    session.mirror()
+    test(None, session.uvPolygons(), containedPolygons(mirrorPoints(rotated), fitTrim))
+
+    try:
+        session.rotate()
+        raise Exception("Error test failed: rotating a fit without degrees")
+    except TrimmerException:
+        pass
+
+    grown = IndexedMesh.fromPolygons(strip)
+    record = UnwrapRecord([5, 7], faceHashes(mesh), [], UnwrapLayout.unwrap(mesh))
+    test(None, record.grow([5, 7, 9], faceHashes(grown), grown, []).flatMesh.toPolygons(), unwrap(strip))
+    test(None, record.grow([5, 7, 9], faceHashes(grown), grown, [(0, 1)]) == None, True)
+    test(None, record.grow([7, 9], faceHashes(grown.subset([1, 2])), grown.subset([1, 2]), []).flatMesh.toPolygons(), unwrap(strip)[1:])
+    moved = IndexedMesh.fromPolygons([strip[0], [(1, 0, 1), (2, 0, 0), (2, 1, 0), (1, 1, 0)], strip[2]])
+    test(None, record.grow([5, 7, 9], faceHashes(moved), moved, []) == None, True)
+
+    # apply, confirm and apply again with a face added in front: the second apply grows the first layout
+    folded = [[(0, 0, 1), (1, 0, 0), (1, 1, 0), (0, 1, 1)], strip[1]]
+    history = UnwrapHistory()
+    first = history.unwrap("Cube", [7], IndexedMesh.fromPolygons(folded[1:]), [], False)
+    session = ApplySession([7], IndexedMesh.fromPolygons(folded[1:]), [], first, None, fitTrim, 'FIT')
+    session.fit()
+    session = None
+    second = history.unwrap("Cube", [5, 7], IndexedMesh.fromPolygons(folded), [], False)
+    test(None, second[0][1].toPolygons()[1], first[0][1].toPolygons()[0])
+    test(None, compare(second[0][1].toPolygons(), unwrap(folded)) != 0, True)
+    test(None, history.records["Cube"].faceIndexes, [5, 7])
+    test(None, history.unwrap("Sphere", [5, 7], IndexedMesh.fromPolygons(folded), [], False)[0][1].toPolygons(), second[0][1].toPolygons())
+
+    test(groupSeams, [[[0, 1], [1, 2, 3], [2, 3]], [1, 3, 2], 4], [(0, 1), (0, 2), (1, 2)])
+    fin = IndexedMesh.fromPolygons([strip[0], [(1, 0, 0), (0, 0, 0), (0, -1, 0), (1, -1, 0)], [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)]])
+    finGroups = groupSessions([3, 4, 5], fin, [[0, 1, 2]], [0, 0, 0], {0: (None, fitTrim, 'FIT')}, True)
+    test(None, finGroups[0][1].islands, [[0], [1], [2]])
+    test(None, finGroups[0][1].seams == {(3, 4), (3, 5), (4, 5)}, True)
+    kit = IndexedMesh.fromPolygons(strip + [[(i, 0, 0), (i, 0, 1), (i + 1, 0, 1), (i + 1, 0, 0)] for i in range(2)])
+    groups = groupSessions([10, 11, 12, 13, 14], kit, [], [0, 0, 0, 1, 2], {0: (None, fitTrim, 'FIT'), 1: (None, fillTrim, 'FILL'), 3: (None, fitTrim, 'FILL')}, False)
+    test(None, [positions for positions, _ in groups], [[0, 1, 2], [3]])
+    test(None, [session.faceIndexes for _, session in groups], [[10, 11, 12], [13]])
+    test(None, groups[0][1].uvPolygons(), containedPolygons(unwrap(strip), fitTrim))
+    test(None, groups[1][1].uvPolygons(), filledUvCoords(fillTrim, unwrap(kit.subset([3]))))
+
+    try:
+        groupSessions([10, 11, 12], kit.subset([0, 1, 2]), [], [4, 4, 4], {4: (None, fillTrim[:3], 'FILL')}, True)
+        raise Exception("Error test failed: filling a group with a mismatching boundary")
+    except TrimmerException as te:
+        test(None, str(te).startswith("Trim group 4: "), True)
+
+    try:
+        groupSessions([10, 11, 12], kit.subset([0, 1, 2]), [], [2, 2, 2], {2: (None, fitTrim, 'STRETCH')}, False)
+        raise Exception("Error test failed: fitting a group with an unknown fit option")
+    except TrimmerException as te:
+        test(None, str(te), "Trim group 2: Invalid fit option: STRETCH")
+
+# headless
+
+def testHeadless():
+    trims = {"a": [[0, 0], [1, 0], [1, 1], [0, 1]], "b": [[0, 0], [0.5, 0], [0.5, 0.5], [0, 0.5]]}
+    groupTrims, separateIslands, sharpAngles = readTrimsheet({"trims": trims, "groups": {"Wood": {"trim": "a"}, "Iron": {"trim": "b", "fit": "FIT", "sharpAngle": 30}}})
+    test(None, groupTrims == {"Wood": ("a", [(0, 0), (1, 0), (1, 1), (0, 1)], 'FILL'), "Iron": ("b", [(0, 0), (0.5, 0), (0.5, 0.5), (0, 0.5)], 'FIT')}, True)
+    test(None, separateIslands, False)
+    test(None, sharpAngles == {"Iron": 30}, True)
+    test(None, groupKeys(["Wood", "Glass"], {"Wood": None, "*": None}) == ["Wood", "*"], True)
+    for definition in [{"trims": trims, "groups": {"Wood": {"trim": "c"}}}, {"trims": trims, "groups": {"Wood": {"trim": "a", "fit": "STRETCH"}}}, {"trims": trims, "groups": {"Wood": {"trim": "a", "sharpAngle": "30"}}}]:
+        try:
+            readTrimsheet(definition)
+            raise Exception(f"Error test failed: readTrimsheet({definition})")
+        except TrimmerException:
+            pass
+
+    obj = ObjMesh([
+        "v 0 0 0", "v 1 0 0", "v 1 1 0", "v 0 1 0", "v 2 0 0", "v 2 1 0",
+        "vt 0.5 0.5",
+        "usemtl Wood", "f 1/1 2/1 3/1 4/1",
+        "usemtl Iron", "f 2 5 6 3",
+        "vt 0.25 0.25",
+        "usemtl Glass", "f -5/2 -2/2 -1/2"
+    ])
+    test(None, obj.faceKeys == ["Wood", "Iron", "Glass"], True)
+    test(None, obj.mesh.faceLists(), [[0, 1, 2, 3], [1, 4, 5, 2], [1, 4, 5]])
+    uvs = trimUvs(obj.mesh, obj.faceKeys, groupTrims, separateIslands)
+    test(None, uvs[:8], [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0), (0.5, 0), (0.5, 0.5), (0, 0.5)])
+    lines = obj.writeLines(uvs)
+    test(None, lines[8:16] == [f"vt {u:.6f} {v:.6f}" for u, v in uvs[:8].tolist()], True)
+    test(None, [line for line in lines if line.startswith('f ')] == ["f 1/2 2/3 3/4 4/5", "f 2/6 5/7 6/8 3/9", "f 2/10 5/10 6/10"], True)
+
+    ply = PlyMesh([
+        "ply", "format ascii 1.0",
+        "element vertex 4", "property float x", "property float y", "property float z",
+        "element face 2", "property list uchar int vertex_indices", "property int material_index",
+        "end_header",
+        "0 0 0", "1 0 0", "1 1 0", "0 1 0",
+        "3 0 1 2 1", "3 0 2 3 2"
+    ], "material_index")
+    test(None, ply.faceKeys == ["1", "2"], True)
+    groupTrims, _, _ = readTrimsheet({"trims": {"t": [[0, 0], [1, 0], [0, 1]]}, "groups": {"1": {"trim": "t"}}})
+    lines = ply.writeLines(trimUvs(ply.mesh, ply.faceKeys, groupTrims, False))
+    test(None, lines[2] == "element vertex 5", True)
+    test(None, lines[-7:] == [
+        "0 0 0 0.000000 0.000000", "1 0 0 1.000000 0.000000", "1 1 0 0.000000 0.000000", "1 1 0 0.000000 1.000000", "0 1 0 0.000000 0.000000",
+        "3 0 1 3 1", "3 0 2 4 2"
+    ], True)
+
+    # a closed box can't be flattened without seams, cutting it at its sharp edges gives every side the trim
+    box = ObjMesh([
+        "v 0 0 0", "v 1 0 0", "v 1 1 0", "v 0 1 0", "v 0 0 1", "v 1 0 1", "v 1 1 1", "v 0 1 1",
+        "usemtl Box", "f 1 4 3 2", "f 5 6 7 8", "f 1 2 6 5", "f 2 3 7 6", "f 3 4 8 7", "f 4 1 5 8"
+    ])
+    definition = {"trims": trims, "groups": {"Box": {"trim": "b", "fit": "FIT"}}, "separateIslands": True}
+    try:
+        trimUvs(box.mesh, box.faceKeys, *readTrimsheet(definition))
+        raise Exception("Error test failed: trimming a closed box without seams")
+    except TrimmerException as te:
+        test(None, "not unwrappable" in str(te), True)
+
+    definition["groups"]["Box"]["sharpAngle"] = 30
+    uvs = trimUvs(box.mesh, box.faceKeys, *readTrimsheet(definition))
+    test(None, [sorted(face) for face in uvs.reshape(6, 4, 2).tolist()], [[[0, 0], [0, 0.5], [0.5, 0], [0.5, 0.5]]] * 6)
+
 # metadata matches
 
 def initInfo():
@@ -441,8 +863,12 @@ def testMetadataMatching():
 
 def runTests():
     testUtils()
+    testIndexedMesh()
+    testGeometry()
     testUtils2D()
     testUnwrapping()
+    testApplySession()
+    testHeadless()
 
 if __name__ == '__main__':
     runTests()